@@ -0,0 +1,178 @@
+"""Page-settled detection for Playwright pages, shared by the researcher and presenter agents.
+
+A page counts as settled once three signals have been quiet at the same time:
+  * network — at most MAX_INFLIGHT requests in flight for NETWORK_QUIET_MS
+  * DOM — no MutationObserver childList/characterData records for DOM_QUIET_MS
+  * layout — document size and element count unchanged across animation frames for DOM_QUIET_MS
+
+SETTLE_CEILING bounds the wait, so pages that never go quiet (carousels, polling, tickers)
+still move on. This replaces fixed sleeps after navigations: fast sites continue as soon as
+they are ready and heavy SPAs get the time they need.
+"""
+
+import asyncio
+import time
+
+from playwright.async_api import Error as PlaywrightError, Page, Request
+
+NETWORK_QUIET_MS = 500
+DOM_QUIET_MS = 300
+SETTLE_CEILING = 5.0
+# Analytics beacons and long-polls keep a request or two open indefinitely
+MAX_INFLIGHT = 2
+# Long-lived streams that never finish; they never block settling
+IGNORED_RESOURCE_TYPES = {"eventsource", "websocket", "media"}
+
+# Resolves once the DOM and layout have both been quiet for quietMs, or after timeoutMs.
+# Attribute mutations are ignored: hover styles and animations flip them constantly, and
+# any that move content show up in the layout signature.
+DOM_SETTLE_JS = """
+async ({quietMs, timeoutMs}) => {
+    const start = performance.now();
+    let lastChange = start;
+    let mutations = 0;
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        lastChange = performance.now();
+    });
+    observer.observe(document, {childList: true, subtree: true, characterData: true});
+
+    const layout = () => {
+        const root = document.documentElement;
+        if (!root) return '';
+        return [root.scrollWidth, root.scrollHeight, document.getElementsByTagName('*').length].join(',');
+    };
+    // rAF is throttled in background pages; the timeout keeps the loop turning regardless
+    const nextFrame = () => new Promise(resolve => {
+        requestAnimationFrame(() => resolve());
+        setTimeout(resolve, 100);
+    });
+
+    let signature = layout();
+    let layoutChanges = 0;
+    try {
+        while (true) {
+            await nextFrame();
+            const now = performance.now();
+            const current = layout();
+            if (current !== signature) {
+                signature = current;
+                layoutChanges++;
+                lastChange = now;
+            }
+            const quietFor = now - lastChange;
+            if (quietFor >= quietMs && document.readyState !== 'loading') {
+                return {settled: true, mutations, layoutChanges, waitedMs: Math.round(now - start)};
+            }
+            if (now - start >= timeoutMs) {
+                return {settled: false, mutations, layoutChanges, waitedMs: Math.round(now - start)};
+            }
+        }
+    } finally {
+        observer.disconnect();
+    }
+}
+"""
+
+
+class PageSettle:
+    """Tracks a page's in-flight requests and waits for it to settle.
+
+    Attach right after creating the page so requests started by a goto() or a click are seen
+    from the beginning; the listeners stay for the page's lifetime.
+    """
+
+    def __init__(self, page: Page, network_quiet_ms: int = NETWORK_QUIET_MS,
+                 dom_quiet_ms: int = DOM_QUIET_MS, max_inflight: int = MAX_INFLIGHT):
+        self._page = page
+        self._network_quiet = network_quiet_ms / 1000
+        self._dom_quiet_ms = dom_quiet_ms
+        self._max_inflight = max_inflight
+        self._inflight: set[Request] = set()
+        # When the in-flight count last dropped to max_inflight or below (None while busy)
+        self._network_idle_since: float | None = time.monotonic()
+        self._network_changed = asyncio.Event()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def _on_request(self, request: Request):
+        if request.resource_type in IGNORED_RESOURCE_TYPES:
+            return
+        self._inflight.add(request)
+        if len(self._inflight) > self._max_inflight:
+            self._network_idle_since = None
+        self._network_changed.set()
+
+    def _on_request_done(self, request: Request):
+        if request not in self._inflight:
+            return
+        self._inflight.discard(request)
+        if len(self._inflight) <= self._max_inflight and self._network_idle_since is None:
+            self._network_idle_since = time.monotonic()
+        self._network_changed.set()
+
+    def _network_quiet_for(self, now: float) -> float:
+        if self._network_idle_since is None:
+            return 0.0
+        return now - self._network_idle_since
+
+    async def _wait_network_quiet(self, deadline: float) -> bool:
+        """Wait until the network has been idle for the quiet window. False if the deadline hits."""
+        while True:
+            now = time.monotonic()
+            remaining = self._network_quiet - self._network_quiet_for(now)
+            if remaining <= 0:
+                return True
+            if now >= deadline:
+                return False
+            self._network_changed.clear()
+            try:
+                await asyncio.wait_for(self._network_changed.wait(), min(remaining, deadline - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def wait(self, ceiling: float = SETTLE_CEILING) -> dict:
+        """Wait until network, DOM and layout are quiet together, or ceiling seconds pass.
+
+        Returns timing details: settled (False if the ceiling was hit), waited_ms,
+        inflight requests at the end, and DOM mutations / layout changes seen in the last check.
+        """
+        start = time.monotonic()
+        deadline = start + ceiling
+        dom: dict = {}
+        settled = False
+        while True:
+            remaining_ms = (deadline - time.monotonic()) * 1000
+            if remaining_ms <= 0:
+                break
+            # Both quiet windows run at once, so a fast page costs one window rather than two
+            network_task = asyncio.ensure_future(self._wait_network_quiet(deadline))
+            try:
+                dom = await self._page.evaluate(
+                    DOM_SETTLE_JS, {"quietMs": self._dom_quiet_ms, "timeoutMs": remaining_ms}
+                )
+            except PlaywrightError:
+                # The document was replaced mid-check (a navigation committed): start over on the new one
+                network_task.cancel()
+                await asyncio.sleep(0.05)
+                continue
+            network_quiet = await network_task
+            if not dom.get("settled") or not network_quiet:
+                break
+            # Requests that started after the network window closed mean the page is still moving
+            if self._network_quiet_for(time.monotonic()) >= self._network_quiet:
+                settled = True
+                break
+
+        return {
+            "settled": settled,
+            "waited_ms": round((time.monotonic() - start) * 1000, 1),
+            "inflight": len(self._inflight),
+            "mutations": dom.get("mutations", 0),
+            "layout_changes": dom.get("layoutChanges", 0),
+        }
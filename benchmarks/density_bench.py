@@ -0,0 +1,146 @@
+"""Presenter density benchmark — dedicated Chromium per demo vs one shared Chromium.
+
+Starts N concurrent BrowserScreenShare sessions on a local synthetic page, either each with
+its own browser (the default deployment) or all attached to one SharedChromium with a
+BrowserContext per session, and measures the memory of the whole process tree. Reports MB
+per demo over the idle baseline, demos per GB, and the FPS each session still achieves.
+
+PSS is used where the OS provides it (Linux), since RSS counts Chromium's shared pages once
+per process and overstates the dedicated model.
+
+Usage:
+    python -m benchmarks.density_bench
+    python -m benchmarks.density_bench --sessions 1 4 8 --page scroll --json density.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import psutil
+
+from benchmarks.screen_share_bench import PAGES, StubVideoSource, serve_pages
+from presenter_agent.browser_pool import SharedChromium
+from presenter_agent.screen_share import BrowserScreenShare
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SECONDS = 3.0
+SAMPLE_EVERY_SECONDS = 1.0
+MODELS = ("dedicated", "shared")
+
+
+def tree_memory_mb() -> tuple[float, str]:
+    """Memory of this process and all its children, as (MB, "pss" | "rss")."""
+    total = 0
+    kind = "pss"
+    for proc in [psutil.Process()] + psutil.Process().children(recursive=True):
+        try:
+            info = proc.memory_full_info()
+            pss = getattr(info, "pss", None)
+            if pss is None:
+                kind = "rss"
+            total += info.rss if pss is None else pss
+        except psutil.AccessDenied:
+            kind = "rss"
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024), kind
+
+
+async def run_case(base_url: str, model: str, sessions: int, page: str, duration: float) -> dict:
+    """Run `sessions` concurrent screen shares under one browser model."""
+    shared = SharedChromium(max_contexts=sessions) if model == "shared" else None
+    baseline_mb, memory_kind = tree_memory_mb()
+    screen_shares = []
+    sources = []
+    try:
+        for _ in range(sessions):
+            screen_share = BrowserScreenShare(best_tier="full", worst_tier="full", browser_pool=shared)
+            screen_shares.append(screen_share)
+            await screen_share.open(f"{base_url}/{page}")
+            source = StubVideoSource()
+            sources.append(source)
+            await screen_share.start_capture(source)
+
+        await asyncio.sleep(WARMUP_SECONDS)
+        for source in sources:
+            source.reset()
+        samples = []
+        start = time.monotonic()
+        while time.monotonic() - start < duration:
+            await asyncio.sleep(SAMPLE_EVERY_SECONDS)
+            samples.append(tree_memory_mb()[0])
+        elapsed = time.monotonic() - start
+        usage = [await s.resource_usage() for s in screen_shares]
+
+        peak_mb = max(samples)
+        per_demo_mb = (peak_mb - baseline_mb) / sessions
+        fps = [source.frames / elapsed for source in sources]
+        return {
+            "model": model,
+            "sessions": sessions,
+            "page": page,
+            "memory": memory_kind,
+            "baseline_mb": round(baseline_mb, 1),
+            "peak_mb": round(peak_mb, 1),
+            "mean_mb": round(sum(samples) / len(samples), 1),
+            "mb_per_demo": round(per_demo_mb, 1),
+            "demos_per_gb": round(1024 / per_demo_mb, 1) if per_demo_mb > 0 else None,
+            "fps_min": round(min(fps), 1),
+            "fps_mean": round(sum(fps) / len(fps), 1),
+            "js_heap_mb_per_demo": round(sum(u.get("js_heap_used_mb", 0) for u in usage) / sessions, 1),
+        }
+    finally:
+        for screen_share in screen_shares:
+            await screen_share.stop()
+        if shared:
+            shared.close()
+
+
+def print_table(results: list[dict]):
+    columns = [
+        "model", "sessions", "page", "memory", "peak_mb", "mb_per_demo", "demos_per_gb",
+        "fps_min", "fps_mean", "js_heap_mb_per_demo",
+    ]
+    widths = {c: max(len(c), *(len(str(r.get(c))) for r in results)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in results:
+        print("  ".join(str(r.get(c)).ljust(widths[c]) for c in columns))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=MODELS)
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--page", default="idle", choices=list(PAGES))
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per case")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    server, base_url = serve_pages()
+    results = []
+    try:
+        for model in args.models:
+            for sessions in args.sessions:
+                print(f"Running {model} x{sessions} ...", flush=True)
+                results.append(await run_case(base_url, model, sessions, args.page, args.duration))
+    finally:
+        server.shutdown()
+
+    print()
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,279 @@
+"""Screen share pipeline benchmark — BrowserScreenShare against local synthetic pages.
+
+Serves a set of static pages from a local HTTP server, drives BrowserScreenShare into a stub
+video source (no LiveKit server or network needed) and reports, per capture mode and page:
+achieved FPS, per-stage latency, frame pacing, dropped frames, CPU and RSS.
+
+Usage:
+    python -m benchmarks.screen_share_bench
+    python -m benchmarks.screen_share_bench --modes screenshot screencast --pages idle scroll \\
+        --duration 15 --json bench_output.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+from presenter_agent.screen_share import CAPTURE_MODES, BrowserScreenShare
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SECONDS = 1.0
+SCROLL_STEP_PX = 600
+SCROLL_EVERY_SECONDS = 1.5
+
+PAGES = {
+    "idle": """<!doctype html>
+<html><head><title>Idle</title></head>
+<body style="font-family: sans-serif; margin: 40px">
+  <nav><a href="/idle">Home</a> <a href="/scroll">Docs</a></nav>
+  <h1>Static marketing page</h1>
+  <p>Nothing on this page moves. The presenter is talking over it.</p>
+  <button>Start Free Trial</button>
+</body></html>""",
+
+    "animation": """<!doctype html>
+<html><head><title>Animation</title>
+<style>
+  body { margin: 0; background: #111; overflow: hidden; }
+  .box { position: absolute; width: 60px; height: 60px; border-radius: 12px;
+         animation: spin 1.2s linear infinite, drift 3s ease-in-out infinite alternate; }
+  @keyframes spin { to { transform: rotate(360deg); } }
+  @keyframes drift { from { margin-left: 0; } to { margin-left: 200px; } }
+</style></head>
+<body><script>
+  for (let i = 0; i < 200; i++) {
+    const d = document.createElement('div');
+    d.className = 'box';
+    d.style.left = (i % 20) * 60 + 'px';
+    d.style.top = Math.floor(i / 20) * 70 + 'px';
+    d.style.background = `hsl(${i * 7 % 360}, 70%, 55%)`;
+    d.style.animationDelay = (i % 10) * -0.1 + 's';
+    document.body.appendChild(d);
+  }
+</script></body></html>""",
+
+    "scroll": """<!doctype html>
+<html><head><title>Long scroll</title></head>
+<body style="font-family: sans-serif; margin: 40px"><script>
+  for (let i = 0; i < 300; i++) {
+    const s = document.createElement('section');
+    s.innerHTML = `<h2>Section ${i}</h2><p>${'Lorem ipsum dolor sit amet. '.repeat(12)}</p>`;
+    s.style.background = i % 2 ? '#f4f4f8' : '#fff';
+    s.style.padding = '12px';
+    document.body.appendChild(s);
+  }
+</script></body></html>""",
+
+    # A playing <video> without a media file: fed from a canvas capture stream
+    "video": """<!doctype html>
+<html><head><title>Video</title></head>
+<body style="margin: 40px; font-family: sans-serif">
+  <h1>Product video</h1>
+  <video id="v" autoplay muted width="960" height="540"></video>
+  <canvas id="c" width="960" height="540" style="display: none"></canvas>
+<script>
+  const c = document.getElementById('c');
+  const ctx = c.getContext('2d');
+  let t = 0;
+  (function draw() {
+    t++;
+    ctx.fillStyle = `hsl(${t % 360}, 60%, 40%)`;
+    ctx.fillRect(0, 0, c.width, c.height);
+    ctx.fillStyle = '#fff';
+    ctx.font = '64px sans-serif';
+    ctx.fillText('frame ' + t, 80 + (t * 4) % 600, 280);
+    requestAnimationFrame(draw);
+  })();
+  document.getElementById('v').srcObject = c.captureStream(30);
+</script></body></html>""",
+}
+
+
+class StubVideoSource:
+    """Stands in for rtc.VideoSource and records what the capture pipeline pushes."""
+
+    def __init__(self):
+        self.frames = 0
+        self.first_push: float | None = None
+        self.last_push: float | None = None
+
+    def capture_frame(self, frame, *, timestamp_us: int = 0, rotation: int = 0):
+        now = time.monotonic()
+        if self.first_push is None:
+            self.first_push = now
+        self.last_push = now
+        self.frames += 1
+
+    def reset(self):
+        self.frames = 0
+        self.first_push = None
+        self.last_push = None
+
+
+def serve_pages() -> tuple[ThreadingHTTPServer, str]:
+    """Serve PAGES from 127.0.0.1 on a free port. Returns (server, base_url)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = PAGES.get(self.path.strip("/"))
+            if body is None:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _process_tree(proc: psutil.Process) -> list[psutil.Process]:
+    return [proc] + proc.children(recursive=True)
+
+
+def _tree_cpu_seconds(procs: list[psutil.Process]) -> float:
+    total = 0.0
+    for p in procs:
+        try:
+            t = p.cpu_times()
+            total += t.user + t.system
+        except psutil.Error:
+            pass
+    return total
+
+
+def _tree_rss_mb(procs: list[psutil.Process]) -> float:
+    total = 0
+    for p in procs:
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+async def _drive_scroll(screen_share: BrowserScreenShare):
+    """Keep the long-scroll page moving with the presenter's own smooth scroll."""
+    while True:
+        at_bottom = await screen_share.page.evaluate(
+            "window.scrollY + window.innerHeight >= document.body.scrollHeight - 10"
+        )
+        if at_bottom:
+            await screen_share.page.evaluate("window.scrollTo(0, 0)")
+        await screen_share.scroll_down(SCROLL_STEP_PX)
+        await asyncio.sleep(SCROLL_EVERY_SECONDS)
+
+
+async def run_case(base_url: str, mode: str, page: str, duration: float, adaptive: bool) -> dict:
+    """Benchmark one capture mode on one page."""
+    tiers = {} if adaptive else {"best_tier": "full", "worst_tier": "full"}
+    screen_share = BrowserScreenShare(capture_mode=mode, **tiers)
+    source = StubVideoSource()
+    driver = None
+    try:
+        await screen_share.open(f"{base_url}/{page}")
+        await screen_share.start_capture(source)
+        if page == "scroll":
+            driver = asyncio.create_task(_drive_scroll(screen_share))
+
+        await asyncio.sleep(WARMUP_SECONDS)
+        procs = _process_tree(psutil.Process())
+        counters_before = screen_share.capture_counters()
+        cpu_before = _tree_cpu_seconds(procs)
+        source.reset()
+        start = time.monotonic()
+        peak_rss = 0.0
+        while time.monotonic() - start < duration:
+            await asyncio.sleep(0.5)
+            peak_rss = max(peak_rss, _tree_rss_mb(_process_tree(psutil.Process())))
+        elapsed = time.monotonic() - start
+        cpu_seconds = _tree_cpu_seconds(procs) - cpu_before
+
+        counters = screen_share.capture_counters()
+        tier = screen_share.capture_tier
+        stages = screen_share.capture_metrics()["stages"]
+        intervals = screen_share.frame_interval_stats()
+        return {
+            "mode": mode,
+            "page": page,
+            "duration_s": round(elapsed, 2),
+            "fps_pushed": round(source.frames / elapsed, 1),
+            "fps_new": round(
+                (counters["frames_decoded"] - counters_before["frames_decoded"]) / elapsed, 1
+            ) if mode != "damage" else None,
+            "screenshot_p50_ms": stages["screenshot_ms"]["p50"],
+            "screenshot_p99_ms": stages["screenshot_ms"]["p99"],
+            "decode_p50_ms": stages["decode_ms"]["p50"],
+            "decode_p99_ms": stages["decode_ms"]["p99"],
+            "push_p99_ms": stages["push_ms"]["p99"],
+            "interval_p50_ms": intervals["p50"],
+            "interval_p99_ms": intervals["p99"],
+            "frames_dropped": counters["frames_dropped"] - counters_before["frames_dropped"],
+            "ticks_dropped": counters["ticks_dropped"] - counters_before["ticks_dropped"],
+            "frames_suppressed": counters["frames_suppressed"] - counters_before["frames_suppressed"],
+            "tier": tier["name"],
+            "cpu_pct": round(100 * cpu_seconds / elapsed, 1),
+            "peak_rss_mb": round(peak_rss, 1),
+        }
+    finally:
+        if driver:
+            driver.cancel()
+        await screen_share.stop()
+
+
+def print_table(results: list[dict]):
+    columns = [
+        "mode", "page", "fps_pushed", "fps_new", "screenshot_p50_ms", "screenshot_p99_ms",
+        "decode_p50_ms", "decode_p99_ms", "push_p99_ms",
+        "interval_p50_ms", "interval_p99_ms", "frames_dropped", "ticks_dropped",
+        "frames_suppressed", "cpu_pct", "peak_rss_mb",
+    ]
+    widths = {c: max(len(c), *(len(str(r.get(c))) for r in results)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in results:
+        print("  ".join(str(r.get(c)).ljust(widths[c]) for c in columns))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=list(CAPTURE_MODES), choices=CAPTURE_MODES)
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per case")
+    parser.add_argument("--adaptive", action="store_true", help="Let the adaptive controller change tiers")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    server, base_url = serve_pages()
+    results = []
+    try:
+        for mode in args.modes:
+            for page in args.pages:
+                print(f"Running {mode} / {page} ...", flush=True)
+                results.append(await run_case(base_url, mode, page, args.duration, args.adaptive))
+    finally:
+        server.shutdown()
+
+    print()
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+"""Browser action queue — tool calls enqueue page choreography and return immediately.
+
+Actions run one at a time in submission order on a single worker task, so the agent can keep
+talking while the cursor moves. Results are picked up later: take_finished() hands each
+finished action to the next tool call, and listeners are called as each one completes.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Actions allowed to wait behind the running one before submit() refuses new work
+MAX_QUEUED_ACTIONS = 8
+
+
+class ActionHandle:
+    """One queued action. status moves queued → running → done | failed."""
+
+    def __init__(self, action_id: int, name: str, description: str):
+        self.id = action_id
+        self.name = name
+        self.description = description
+        self.status = "queued"
+        # Short outcome line, plus optional longer text (e.g. the guide of a page a click opened)
+        self.result: str | None = None
+        self.detail: str | None = None
+        self.error: str | None = None
+        self.queued_at = time.monotonic()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._done = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the action to finish. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def summary(self) -> str:
+        if self.status == "failed":
+            return f"Action #{self.id} {self.description} failed: {self.error}"
+        if self.status == "done":
+            return f"Action #{self.id} {self.description}: {self.result or 'done'}"
+        return f"Action #{self.id} {self.description}: {self.status}"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "queue_ms": round(((self.started_at or time.monotonic()) - self.queued_at) * 1000, 1),
+            "run_ms": round((self.finished_at - self.started_at) * 1000, 1)
+            if self.started_at and self.finished_at else None,
+        }
+
+
+class ActionQueue:
+    """Serial executor for browser actions.
+
+    submit() takes a zero-argument coroutine function. Its return value becomes the handle's
+    result: a string, or a (result, detail) tuple. An exception marks the action failed.
+    """
+
+    def __init__(self, max_queued: int = MAX_QUEUED_ACTIONS):
+        self._max_queued = max_queued
+        self._queue: deque[tuple[ActionHandle, Callable[[], Awaitable]]] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._worker: asyncio.Task | None = None
+        self._finished: list[ActionHandle] = []
+        self._listeners: list[Callable[[ActionHandle], None]] = []
+        self._next_id = 1
+        self.current: ActionHandle | None = None
+
+    @property
+    def pending(self) -> int:
+        """Actions queued or running."""
+        return len(self._queue) + (1 if self.current else 0)
+
+    def add_listener(self, callback: Callable[[ActionHandle], None]):
+        """Call callback(handle) whenever an action finishes (done or failed)."""
+        self._listeners.append(callback)
+
+    def submit(self, name: str, description: str, fn: Callable[[], Awaitable]) -> ActionHandle:
+        if len(self._queue) >= self._max_queued:
+            raise RuntimeError(f"{len(self._queue)} browser actions are already waiting")
+        handle = ActionHandle(self._next_id, name, description)
+        self._next_id += 1
+        self._queue.append((handle, fn))
+        self._idle.clear()
+        self._wakeup.set()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return handle
+
+    async def wait_idle(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted action has finished. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def take_finished(self) -> list[ActionHandle]:
+        """Finished actions not yet handed out, oldest first."""
+        finished, self._finished = self._finished, []
+        return finished
+
+    async def _run(self):
+        while True:
+            if not self._queue:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            handle, fn = self._queue.popleft()
+            self.current = handle
+            handle.status = "running"
+            handle.started_at = time.monotonic()
+            try:
+                outcome = await fn()
+                if isinstance(outcome, tuple):
+                    handle.result, handle.detail = outcome
+                else:
+                    handle.result = outcome
+                handle.status = "done"
+            except asyncio.CancelledError:
+                handle.status = "failed"
+                handle.error = "cancelled"
+                self._finish(handle)
+                raise
+            except Exception as e:
+                handle.status = "failed"
+                handle.error = str(e)
+            self._finish(handle)
+
+    def _finish(self, handle: ActionHandle):
+        handle.finished_at = time.monotonic()
+        self.current = None
+        self._finished.append(handle)
+        handle._done.set()
+        for callback in self._listeners:
+            try:
+                callback(handle)
+            except Exception as e:
+                logger.warning(f"Action listener error: {e}")
+
+    async def close(self):
+        """Cancel the running action and drop everything still queued."""
+        for handle, _ in self._queue:
+            handle.status = "failed"
+            handle.error = "cancelled"
+            handle._done.set()
+        self._queue.clear()
+        self._idle.set()
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
@@ -4,9 +4,11 @@ Uses livekit-agents 1.4.x API (Agent + AgentSession + function_tool).
 """
 
 import asyncio
+import atexit
 import json
 import logging
 import os
+import time
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -16,6 +18,7 @@ from livekit.agents import (
     AgentSession,
     AutoSubscribe,
     JobContext,
+    JobExecutorType,
     JobProcess,
     JobRequest,
     WorkerOptions,
@@ -24,6 +27,7 @@ from livekit.agents import (
 from livekit.plugins import deepgram, silero, anthropic
 import redis.asyncio as aioredis
 
+from presenter_agent.browser_pool import BrowserPool, shared_chromium
 from presenter_agent.screen_share import BrowserScreenShare
 from presenter_agent.tools import create_demo_tools
 
@@ -32,6 +36,18 @@ from backend.json_logger import setup_json_logger, log_event
 logger = setup_json_logger("presenter", "presenter.log")
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
+# "screenshot" (poll), "screencast" (CDP push frames) or "damage" (changed regions only)
+SCREEN_CAPTURE_MODE = os.environ.get("SCREEN_CAPTURE_MODE", "screenshot")
+# Bounds for adaptive capture quality (tier names from capture_controller.CAPTURE_TIERS)
+CAPTURE_BEST_TIER = os.environ.get("CAPTURE_BEST_TIER", "full")
+CAPTURE_WORST_TIER = os.environ.get("CAPTURE_WORST_TIER", "minimal")
+# Launch a browser in each prewarmed job process (dedicated mode). How many are warm follows
+# the worker's idle process count. BROWSER_PREWARM=0 launches a browser per job instead.
+BROWSER_PREWARM = os.environ.get("BROWSER_PREWARM", "1") != "0"
+# "dedicated" (a Chromium process per job) or "shared" (jobs run as threads of one worker
+# process and share Chromium, one BrowserContext per room)
+BROWSER_MODE = os.environ.get("BROWSER_MODE", "dedicated")
+SHARED_BROWSER_MAX_CONTEXTS = int(os.environ.get("SHARED_BROWSER_MAX_CONTEXTS", "8"))
 
 
 async def request_fnc(req: JobRequest):
@@ -43,8 +59,19 @@ async def request_fnc(req: JobRequest):
 
 
 def prewarm(proc: JobProcess):
-    """Pre-load VAD model for faster startup."""
+    """Pre-load VAD model and start launching browsers for faster startup."""
     proc.userdata["vad"] = silero.VAD.load()
+    if BROWSER_MODE == "shared":
+        pool = shared_chromium(SHARED_BROWSER_MAX_CONTEXTS)
+        pool.fill_in_background()
+        proc.userdata["browser_pool"] = pool
+    elif BROWSER_PREWARM:
+        # Each job process runs exactly one job, so it needs exactly one browser
+        pool = BrowserPool(1)
+        # Launches run in the background so a slow Chromium start can't time out process init
+        pool.fill_in_background()
+        atexit.register(pool.close)
+        proc.userdata["browser_pool"] = pool
 
 
 async def get_research_context(room_id: str) -> dict | None:
@@ -119,8 +146,10 @@ You are sharing your screen. The user sees everything you do.
 - The page guide gives you: talking points + a LIVE list of all navigation links, buttons, and other clickable elements.
 - Speak naturally, 2-3 sentences max per turn.
 - Use highlight_element to draw attention to elements (pass visible text, same as click_element).
-- If click_element fails, call get_current_page_guide to refresh the element list, then try the exact text shown.
-- If it still fails, narrate what you wanted to show and move on. Never retry more than once.
+- click_element, scroll_down, scroll_to_element and highlight_element return immediately while the browser acts. Their outcome ("Earlier browser actions: ... done/failed") arrives with your NEXT tool call.
+- After clicking, do not describe the destination page until get_current_page_guide (which waits for queued actions) confirms the click landed on it.
+- If an earlier action is reported as failed, use the element list from get_current_page_guide and retry once with the exact text shown.
+- If it fails again, narrate what you wanted to show and move on. Never retry more than once.
 
 === PRODUCT OVERVIEW ===
 {features_summary if features_summary else "(Research still in progress — call get_current_page_guide and get_research_context for info)"}
@@ -136,7 +165,14 @@ You are sharing your screen. The user sees everything you do.
 
 async def entrypoint(ctx: JobContext):
     """Main agent entrypoint — called when dispatched to a room."""
+    job_start = time.monotonic()
+    timeline = {}
+
+    def mark(name: str):
+        timeline[name] = round((time.monotonic() - job_start) * 1000, 1)
+
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
+    mark("connected")
     logger.info(f"Presenter agent connected to room: {ctx.room.name}")
 
     # Get website URL from room metadata
@@ -145,104 +181,149 @@ async def entrypoint(ctx: JobContext):
     room_id = ctx.room.name
     logger.info(f"Demo URL: {url}")
 
-    # Fetch any existing research
-    research = await get_research_context(room_id)
-    log_event(logger, "research_context_received", "Fetched initial research context", {
-        "room_id": room_id,
-        "url": url,
-        "research_status": research.get("status") if research else "none",
-        "has_knowledge": bool(research and research.get("knowledge")),
-        "has_demo_script": bool(research and research.get("demo_script")),
-    })
-
-    # Start browser and screen share
-    screen_share = BrowserScreenShare()
-    await screen_share.start(ctx.room, url)
-
-    # Create tools
-    tools = create_demo_tools(screen_share, room_id, REDIS_URL)
-
-    # Build the agent
-    instructions = build_instructions(url, research)
-
-    agent = Agent(
-        instructions=instructions,
-        vad=ctx.proc.userdata["vad"],
-        stt=deepgram.STT(),
-        llm=anthropic.LLM(model="claude-haiku-4-5"),
-        tts=deepgram.TTS(),
-        tools=tools,
+    # Start browser and screen share. The track is published with a placeholder frame right
+    # away; the browser launch and navigation overlap with building and starting the agent.
+    screen_share = BrowserScreenShare(
+        capture_mode=SCREEN_CAPTURE_MODE,
+        best_tier=CAPTURE_BEST_TIER,
+        worst_tier=CAPTURE_WORST_TIER,
+        browser_pool=ctx.proc.userdata.get("browser_pool"),
     )
+    mark("screen_share_start")
+    screen_task = asyncio.create_task(screen_share.start(ctx.room, url))
 
-    # Create session and start
-    session = AgentSession()
-    await session.start(
-        agent=agent,
-        room=ctx.room,
-    )
-    log_event(logger, "session_started", f"Presenter session started for room {room_id}", {
-        "room_id": room_id,
-        "url": url,
-    })
-
-    # Greet the user and trigger page guide fetch
-    product_name = ""
-    if research and research.get("knowledge", {}).get("product_name"):
-        product_name = research["knowledge"]["product_name"]
-        await session.say(
-            f"Hello! Welcome to the demo of {product_name}. "
-            "I'm sharing my screen so you can see the website. "
-            "Let me check what's on this page and then walk you through the key features."
+    # Everything after this point can fail or be cancelled (the user leaving early, a page
+    # load timing out); the browser must be released either way
+    monitor_task = None
+    try:
+        # Fetch any existing research
+        research = await get_research_context(room_id)
+        mark("research_fetched")
+        log_event(logger, "research_context_received", "Fetched initial research context", {
+            "room_id": room_id,
+            "url": url,
+            "research_status": research.get("status") if research else "none",
+            "has_knowledge": bool(research and research.get("knowledge")),
+            "has_demo_script": bool(research and research.get("demo_script")),
+        })
+
+        # Create tools
+        tools = create_demo_tools(screen_share, room_id, REDIS_URL)
+
+        # Build the agent
+        instructions = build_instructions(url, research)
+
+        agent = Agent(
+            instructions=instructions,
+            vad=ctx.proc.userdata["vad"],
+            stt=deepgram.STT(),
+            llm=anthropic.LLM(model="claude-haiku-4-5"),
+            tts=deepgram.TTS(),
+            tools=tools,
         )
-    else:
-        await session.say(
-            "Hello! Welcome! I'm sharing my screen and I'll walk you through this website. "
-            "Let me take a look at what's on this page and we'll get started. "
-            "Feel free to ask me anything along the way!"
+
+        # Create session and start
+        session = AgentSession()
+        await session.start(
+            agent=agent,
+            room=ctx.room,
         )
+        mark("session_started")
+        log_event(logger, "session_started", f"Presenter session started for room {room_id}", {
+            "room_id": room_id,
+            "url": url,
+        })
+
+        # Greet the user and trigger page guide fetch
+        product_name = ""
+        if research and research.get("knowledge", {}).get("product_name"):
+            product_name = research["knowledge"]["product_name"]
+            greeting = session.say(
+                f"Hello! Welcome to the demo of {product_name}. "
+                "I'm sharing my screen so you can see the website. "
+                "Let me check what's on this page and then walk you through the key features."
+            )
+        else:
+            greeting = session.say(
+                "Hello! Welcome! I'm sharing my screen and I'll walk you through this website. "
+                "Let me take a look at what's on this page and we'll get started. "
+                "Feel free to ask me anything along the way!"
+            )
+        mark("greeting_started")
+
+        # The greeting plays while the page finishes loading
+        try:
+            await screen_task
+            mark("screen_share_ready")
+        except Exception as e:
+            mark("screen_share_failed")
+            log_event(logger, "screen_share_failed", f"Could not load {url}: {e}", {
+                "room_id": room_id,
+                "url": url,
+                "error": str(e),
+            }, level=logging.ERROR)
+            await greeting
+            greeting = session.say(
+                "I'm sorry, I couldn't load the website on my screen. "
+                "I can still tell you about it, so feel free to ask me anything."
+            )
+        screen_offset = timeline["screen_share_start"]
+        for name, ms in screen_share.startup_timeline().items():
+            timeline[f"screen_{name}"] = round(screen_offset + ms, 1)
+        log_event(logger, "startup_timeline", f"Startup: first frame at {timeline.get('screen_first_frame')}ms", {
+            "room_id": room_id,
+            "url": url,
+            "timeline_ms": dict(sorted(timeline.items(), key=lambda item: item[1])),
+        })
+        await greeting
+
+        # Background task: monitor research updates and refresh instructions
+        async def monitor_research():
+            try:
+                r = aioredis.from_url(REDIS_URL, decode_responses=True)
+                pubsub = r.pubsub()
+                await pubsub.subscribe(f"research_updates:{room_id}")
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        try:
+                            new_research = json.loads(message["data"])
+                            new_instructions = build_instructions(url, new_research)
+                            await agent.update_instructions(new_instructions)
+                            log_event(logger, "instructions_updated", "Updated agent instructions with new research", {
+                                "room_id": room_id,
+                                "research_status": new_research.get("status"),
+                                "instruction_length": len(new_instructions),
+                            })
+                        except Exception as e:
+                            log_event(logger, "instruction_update_failed", f"Error processing research update: {e}", {
+                                "room_id": room_id,
+                                "error": str(e),
+                            }, level=logging.ERROR)
+            except asyncio.CancelledError:
+                pass
+
+        monitor_task = asyncio.create_task(monitor_research())
 
-    # Background task: monitor research updates and refresh instructions
-    async def monitor_research():
+        # Keep alive
         try:
-            r = aioredis.from_url(REDIS_URL, decode_responses=True)
-            pubsub = r.pubsub()
-            await pubsub.subscribe(f"research_updates:{room_id}")
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    try:
-                        new_research = json.loads(message["data"])
-                        new_instructions = build_instructions(url, new_research)
-                        await agent.update_instructions(new_instructions)
-                        log_event(logger, "instructions_updated", "Updated agent instructions with new research", {
-                            "room_id": room_id,
-                            "research_status": new_research.get("status"),
-                            "instruction_length": len(new_instructions),
-                        })
-                    except Exception as e:
-                        log_event(logger, "instruction_update_failed", f"Error processing research update: {e}", {
-                            "room_id": room_id,
-                            "error": str(e),
-                        }, level=logging.ERROR)
+            await asyncio.Future()
         except asyncio.CancelledError:
             pass
-
-    monitor_task = asyncio.create_task(monitor_research())
-
-    # Keep alive
-    try:
-        await asyncio.Future()
-    except asyncio.CancelledError:
-        pass
     finally:
-        monitor_task.cancel()
+        if monitor_task:
+            monitor_task.cancel()
+        screen_task.cancel()
+        await asyncio.gather(screen_task, return_exceptions=True)
         await screen_share.stop()
 
 
 if __name__ == "__main__":
-    cli.run_app(
-        WorkerOptions(
-            entrypoint_fnc=entrypoint,
-            request_fnc=request_fnc,
-            prewarm_fnc=prewarm,
-        ),
+    options = WorkerOptions(
+        entrypoint_fnc=entrypoint,
+        request_fnc=request_fnc,
+        prewarm_fnc=prewarm,
     )
+    if BROWSER_MODE == "shared":
+        # Jobs run as threads of one process so they share the browser
+        options.job_executor_type = JobExecutorType.THREAD
+    cli.run_app(options)
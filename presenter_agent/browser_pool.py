@@ -0,0 +1,334 @@
+"""Prewarmed Chromium pool — browsers launched in the worker's prewarm step, leased by jobs.
+
+Launching Chromium is the slow part of starting a screen share. The pool starts headless
+Chromium processes with a DevTools port ahead of time; a job leases one and attaches with
+connect_over_cdp, which takes milliseconds instead of a full launch. Playwright objects are
+bound to the event loop that created them, so the pool hands out endpoints, not Browser objects.
+
+Under livekit's default process executor every job gets its own prewarmed process, so the
+worker's idle process count sizes the warm set: each process's pool launches its browsers
+once in prewarm and never refills, since a refill would launch another Chromium in the middle
+of the job's startup.
+
+Chromium is started directly rather than through Playwright's launch(), so nothing else ties
+it to the worker. On Linux each browser gets PR_SET_PDEATHSIG and is terminated when the
+process that launched it dies, even if it is killed before atexit handlers run.
+
+SharedChromium is the dense alternative: sessions lease the same Chromium process and each
+gets its own BrowserContext, up to max_contexts per process.
+"""
+
+import atexit
+import ctypes
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Sessions (BrowserContexts) per shared Chromium process before another process is started
+MAX_SHARED_CONTEXTS = 8
+# How long to wait for a launched browser to open its DevTools port
+LAUNCH_TIMEOUT = 15.0
+
+# Close to what Playwright passes to headless Chromium; --no-sandbox because the workers run
+# as root in containers
+CHROMIUM_ARGS = [
+    "--headless=new",
+    "--remote-debugging-port=0",
+    "--no-sandbox",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-dev-shm-usage",
+    "--hide-scrollbars",
+    "--mute-audio",
+]
+
+
+def chromium_executable() -> str:
+    """Path of the Chromium build Playwright installed."""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as pw:
+        return pw.chromium.executable_path
+
+
+class PooledBrowser:
+    """A launched Chromium process and its DevTools websocket endpoint."""
+
+    def __init__(self, process: subprocess.Popen, endpoint: str, user_data_dir: str):
+        self.process = process
+        self.endpoint = endpoint
+        self.user_data_dir = user_data_dir
+        self.launched_at = time.monotonic()
+        # Sessions currently attached (SharedChromium)
+        self.leases = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self):
+        if self.alive:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+PR_SET_PDEATHSIG = 1
+_libc = ctypes.CDLL(None, use_errno=True) if sys.platform.startswith("linux") else None
+# The parent-death signal fires when the thread that forked the child exits, not only the
+# process. Pool fills run on short-lived threads, so every browser is spawned from this one
+# thread, which lives as long as the process.
+_spawner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chromium-spawn")
+
+
+def _spawn(args: list[str]) -> subprocess.Popen:
+    parent = os.getpid()
+
+    def die_with_parent():
+        _libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+        # The parent may have died between fork and prctl
+        if os.getppid() != parent:
+            os._exit(1)
+
+    return subprocess.Popen(
+        args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        preexec_fn=die_with_parent if _libc is not None else None,
+    )
+
+
+def launch_chromium(executable: str) -> PooledBrowser:
+    """Start headless Chromium and wait for its DevTools endpoint."""
+    user_data_dir = tempfile.mkdtemp(prefix="demo-chromium-")
+    process = _spawner.submit(
+        _spawn, [executable, *CHROMIUM_ARGS, f"--user-data-dir={user_data_dir}", "about:blank"]
+    ).result()
+    # Chromium writes "<port>\n<browser ws path>" here once DevTools is listening
+    port_file = os.path.join(user_data_dir, "DevToolsActivePort")
+    deadline = time.monotonic() + LAUNCH_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            with open(port_file) as f:
+                lines = f.read().split()
+            if len(lines) >= 2:
+                return PooledBrowser(process, f"ws://127.0.0.1:{lines[0]}{lines[1]}", user_data_dir)
+        except FileNotFoundError:
+            pass
+        time.sleep(0.05)
+    browser = PooledBrowser(process, "", user_data_dir)
+    browser.close()
+    raise RuntimeError(f"Chromium did not open a DevTools port within {LAUNCH_TIMEOUT}s")
+
+
+class BrowserPool:
+    """Thread-safe pool of ready Chromium processes, filled once ahead of the job."""
+
+    def __init__(self, size: int = 1, executable: str | None = None):
+        self._size = max(1, size)
+        self._executable = executable
+        self._ready: deque[PooledBrowser] = deque()
+        self._launching = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.launch_seconds: float | None = None
+
+    @property
+    def ready(self) -> int:
+        return len(self._ready)
+
+    def fill(self):
+        """Launch browsers until the pool holds `size` (blocking)."""
+        if self._executable is None:
+            self._executable = chromium_executable()
+        while True:
+            with self._lock:
+                if self._closed or len(self._ready) + self._launching >= self._size:
+                    return
+                self._launching += 1
+            start = time.monotonic()
+            try:
+                browser = launch_chromium(self._executable)
+            except Exception as e:
+                logger.warning(f"Prewarm browser launch failed: {e}")
+                return
+            finally:
+                with self._lock:
+                    self._launching -= 1
+            self.launch_seconds = time.monotonic() - start
+            with self._lock:
+                if self._closed:
+                    browser.close()
+                    return
+                self._ready.append(browser)
+            logger.info(f"Prewarmed browser ready in {self.launch_seconds:.2f}s ({len(self._ready)} in pool)")
+
+    def fill_in_background(self):
+        threading.Thread(target=self.fill, name="browser-pool-fill", daemon=True).start()
+
+    def lease(self) -> PooledBrowser | None:
+        """Take a ready browser, or None if the pool is empty (the caller launches its own)."""
+        browser = None
+        with self._lock:
+            while self._ready:
+                candidate = self._ready.popleft()
+                if candidate.alive:
+                    browser = candidate
+                    break
+                candidate.close()
+            if browser:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return browser
+
+    def release(self, browser: PooledBrowser):
+        """Return a browser whose contexts have all been closed; kept only if the pool has room."""
+        with self._lock:
+            if not self._closed and browser.alive and len(self._ready) < self._size:
+                self._ready.append(browser)
+                return
+        browser.close()
+
+    def stats(self) -> dict:
+        return {
+            "ready": len(self._ready),
+            "size": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "launch_seconds": round(self.launch_seconds, 2) if self.launch_seconds else None,
+        }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            ready, self._ready = list(self._ready), deque()
+        for browser in ready:
+            browser.close()
+
+
+class SharedChromium:
+    """Chromium processes shared by many sessions, one BrowserContext per session.
+
+    Contexts isolate cookies, storage and cache, and Chromium's site isolation keeps each site's
+    renderer in its own process, so a crashed tab only takes down its own session. A crash of
+    the browser process itself is noticed on the next lease, which starts a replacement.
+    Same lease()/release()/fill() interface as BrowserPool.
+    """
+
+    def __init__(self, max_contexts: int = MAX_SHARED_CONTEXTS, executable: str | None = None):
+        self._max_contexts = max(1, max_contexts)
+        self._executable = executable
+        self._browsers: list[PooledBrowser] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.leases = 0
+        self.launches = 0
+        self.crashes = 0
+
+    def _drop_dead(self):
+        for browser in [b for b in self._browsers if not b.alive]:
+            logger.warning(f"Shared browser exited with {browser.process.returncode} "
+                           f"({browser.leases} sessions attached)")
+            self.crashes += 1
+            self._browsers.remove(browser)
+            browser.close()
+
+    def _launch(self) -> PooledBrowser:
+        if self._executable is None:
+            self._executable = chromium_executable()
+        browser = launch_chromium(self._executable)
+        self._browsers.append(browser)
+        self.launches += 1
+        return browser
+
+    def fill(self):
+        """Start the first shared process ahead of the first session (blocking)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._drop_dead()
+            if not self._browsers:
+                try:
+                    self._launch()
+                except Exception as e:
+                    logger.warning(f"Shared browser launch failed: {e}")
+
+    def fill_in_background(self):
+        threading.Thread(target=self.fill, name="shared-browser-fill", daemon=True).start()
+
+    def lease(self) -> PooledBrowser:
+        """Attach a session to the least loaded process with room, starting one if all are full."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Shared browser is closed")
+            self._drop_dead()
+            open_browsers = [b for b in self._browsers if b.leases < self._max_contexts]
+            browser = min(open_browsers, key=lambda b: b.leases) if open_browsers else self._launch()
+            browser.leases += 1
+            self.leases += 1
+            return browser
+
+    def release(self, browser: PooledBrowser):
+        """Detach a session. Idle processes are closed, except the last one (kept warm)."""
+        with self._lock:
+            browser.leases = max(0, browser.leases - 1)
+            if browser.leases or browser not in self._browsers:
+                return
+            if browser.alive and len(self._browsers) == 1 and not self._closed:
+                return
+            self._browsers.remove(browser)
+        browser.close()
+
+    def stats(self) -> dict:
+        return {
+            "processes": len(self._browsers),
+            "contexts": [b.leases for b in self._browsers],
+            "max_contexts": self._max_contexts,
+            "leases": self.leases,
+            "launches": self.launches,
+            "crashes": self.crashes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            browser.close()
+
+
+_shared_chromium: SharedChromium | None = None
+_shared_chromium_lock = threading.Lock()
+
+
+def shared_chromium(max_contexts: int = MAX_SHARED_CONTEXTS) -> SharedChromium:
+    """The process-wide SharedChromium (jobs running as threads of one worker process share it)."""
+    global _shared_chromium
+    with _shared_chromium_lock:
+        if _shared_chromium is None:
+            _shared_chromium = SharedChromium(max_contexts)
+            atexit.register(_shared_chromium.close)
+        return _shared_chromium
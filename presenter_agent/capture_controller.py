@@ -0,0 +1,123 @@
+"""Adaptive capture quality — steps FPS, capture scale and JPEG quality with load.
+
+Several presenter jobs can share one worker host. Instead of all of them degrading together
+at fixed settings, each BrowserScreenShare measures its own per-frame cost and the host CPU
+pressure and moves between quality tiers.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Ordered best → most degraded. scale applies to both capture and published frame size.
+CAPTURE_TIERS = [
+    {"name": "full", "fps": 30, "scale": 1.0, "quality": 65},
+    {"name": "reduced", "fps": 24, "scale": 1.0, "quality": 55},
+    {"name": "low", "fps": 15, "scale": 0.75, "quality": 50},
+    {"name": "minimal", "fps": 10, "scale": 0.5, "quality": 45},
+]
+
+# How often the controller re-evaluates, and how many evaluations a condition must hold for
+EVAL_INTERVAL = 2.0
+DOWNGRADE_AFTER = 2
+UPGRADE_AFTER = 3
+
+# Frame cost as a fraction of the frame budget (1 / fps)
+HIGH_FRAME_LOAD = 0.9
+LOW_FRAME_LOAD = 0.5
+# 1-minute load average per CPU core
+HIGH_CPU_LOAD = 0.9
+LOW_CPU_LOAD = 0.6
+
+# Smoothing for per-frame cost samples
+EWMA_ALPHA = 0.2
+
+
+def host_cpu_load() -> float:
+    """1-minute load average normalized by core count (0.0 where unavailable)."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+class AdaptiveCaptureController:
+    """Picks the capture tier for one screen share.
+
+    The capture path reports per-frame capture and decode time via record_capture() and
+    record_decode(); evaluate() is called periodically and returns True when the tier changed.
+    """
+
+    def __init__(self, best_tier: str = "full", worst_tier: str = "minimal"):
+        names = [t["name"] for t in CAPTURE_TIERS]
+        self._min_index = names.index(best_tier)
+        self._max_index = names.index(worst_tier)
+        if self._min_index > self._max_index:
+            raise ValueError(f"best_tier '{best_tier}' is worse than worst_tier '{worst_tier}'")
+        self._index = self._min_index
+        self._capture_cost = 0.0
+        self._decode_cost = 0.0
+        self._cpu_load = 0.0
+        self._over_count = 0
+        self._under_count = 0
+        self._last_eval = 0.0
+
+    @property
+    def tier(self) -> dict:
+        return CAPTURE_TIERS[self._index]
+
+    @property
+    def frame_load(self) -> float:
+        """Estimated per-frame cost relative to the current frame budget."""
+        return (self._capture_cost + self._decode_cost) * self.tier["fps"]
+
+    def record_capture(self, seconds: float):
+        self._capture_cost += EWMA_ALPHA * (seconds - self._capture_cost)
+
+    def record_decode(self, seconds: float):
+        self._decode_cost += EWMA_ALPHA * (seconds - self._decode_cost)
+
+    def evaluate(self, now: float) -> bool:
+        """Re-check load at most every EVAL_INTERVAL seconds. Returns True if the tier changed."""
+        if now - self._last_eval < EVAL_INTERVAL:
+            return False
+        self._last_eval = now
+        self._cpu_load = host_cpu_load()
+        frame_load = self.frame_load
+
+        if frame_load > HIGH_FRAME_LOAD or self._cpu_load > HIGH_CPU_LOAD:
+            self._over_count += 1
+            self._under_count = 0
+        elif frame_load < LOW_FRAME_LOAD and self._cpu_load < LOW_CPU_LOAD:
+            self._under_count += 1
+            self._over_count = 0
+        else:
+            self._over_count = 0
+            self._under_count = 0
+
+        if self._over_count >= DOWNGRADE_AFTER and self._index < self._max_index:
+            return self._set_index(self._index + 1, frame_load)
+        if self._under_count >= UPGRADE_AFTER and self._index > self._min_index:
+            return self._set_index(self._index - 1, frame_load)
+        return False
+
+    def _set_index(self, index: int, frame_load: float) -> bool:
+        previous = self.tier["name"]
+        self._index = index
+        self._over_count = 0
+        self._under_count = 0
+        logger.info(
+            f"Capture tier {previous} -> {self.tier['name']} "
+            f"(frame load {frame_load:.2f}, cpu load {self._cpu_load:.2f})"
+        )
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            **self.tier,
+            "capture_ms": round(self._capture_cost * 1000, 1),
+            "decode_ms": round(self._decode_cost * 1000, 1),
+            "frame_load": round(self.frame_load, 2),
+            "cpu_load": round(self._cpu_load, 2),
+        }
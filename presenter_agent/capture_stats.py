@@ -0,0 +1,124 @@
+"""Rolling timing statistics and frame pacing for the screen share capture path."""
+
+from collections import deque
+
+# Samples kept per rolling window (~20 s of frames at 30 fps)
+WINDOW_SIZE = 600
+
+
+class RollingWindow:
+    """Fixed-size window of recent samples with percentile summaries."""
+
+    def __init__(self, size: int = WINDOW_SIZE):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float):
+        self._samples.append(value)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def summary(self) -> dict:
+        if not self._samples:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return {
+            "count": len(ordered),
+            "mean": round(sum(ordered) / len(ordered), 2),
+            "p50": round(ordered[int(round(0.50 * last))], 2),
+            "p99": round(ordered[int(round(0.99 * last))], 2),
+            "max": round(ordered[-1], 2),
+        }
+
+
+class FrameScheduler:
+    """Fixed-cadence capture deadlines on the monotonic clock.
+
+    Deadlines advance by exactly one interval per tick, so frame spacing does not drift with
+    capture latency. When the loop falls a full interval or more behind, the missed ticks are
+    skipped (and counted) instead of being captured back to back.
+    """
+
+    def __init__(self):
+        self._deadline: float | None = None
+        self.dropped_ticks = 0
+
+    @property
+    def deadline(self) -> float | None:
+        """Time of the current tick — used as the frame's capture timestamp."""
+        return self._deadline
+
+    def reset(self, now: float):
+        """Restart the grid at now (after waking from idle or an interval change)."""
+        self._deadline = now
+
+    def advance(self, now: float, interval: float) -> float:
+        """Move to the next tick and return how long to sleep until it."""
+        if self._deadline is None:
+            self._deadline = now
+        self._deadline += interval
+        lateness = now - self._deadline
+        if lateness >= interval:
+            missed = int(lateness // interval)
+            self.dropped_ticks += missed
+            self._deadline += missed * interval
+        return max(0.0, self._deadline - now)
+
+
+# Stages with a rolling window in CaptureMetrics. Timings are in ms; fps and dropped are
+# sampled once per report period.
+METRIC_STAGES = ("lock_wait_ms", "screenshot_ms", "decode_ms", "push_ms", "fps", "dropped")
+
+
+class CaptureMetrics:
+    """Rolling per-stage histograms for one screen share.
+
+    Timings are recorded as they happen; close_period() turns the frames pushed and the frames
+    dropped since the previous call into fps/dropped samples and returns that period's figures
+    together with the tool actions that ran in it.
+    """
+
+    def __init__(self):
+        self._windows = {stage: RollingWindow() for stage in METRIC_STAGES}
+        self._period_start: float | None = None
+        self._period_frames = 0
+        self._period_actions: dict[str, int] = {}
+        self._dropped_at_period_start = 0
+
+    def record(self, stage: str, ms: float):
+        self._windows[stage].add(ms)
+
+    def note_frame(self):
+        """A new-content frame was pushed."""
+        self._period_frames += 1
+
+    def note_action(self, name: str):
+        self._period_actions[name] = self._period_actions.get(name, 0) + 1
+
+    def start(self, now: float, dropped_total: int = 0):
+        self._period_start = now
+        self._dropped_at_period_start = dropped_total
+
+    def close_period(self, now: float, dropped_total: int) -> dict:
+        """End the current period. dropped_total is the pipeline's cumulative drop count."""
+        if self._period_start is None:
+            self._period_start = now
+        elapsed = max(now - self._period_start, 1e-6)
+        fps = self._period_frames / elapsed
+        dropped = dropped_total - self._dropped_at_period_start
+        self._windows["fps"].add(fps)
+        self._windows["dropped"].add(dropped)
+        period = {
+            "period_s": round(elapsed, 2),
+            "fps": round(fps, 1),
+            "dropped": dropped,
+            "actions": self._period_actions,
+        }
+        self._period_frames = 0
+        self._period_actions = {}
+        self.start(now, dropped_total)
+        return period
+
+    def summary(self) -> dict:
+        return {stage: window.summary() for stage, window in self._windows.items()}
@@ -0,0 +1,188 @@
+"""Frame decode stage — JPEG screenshots decoded straight into reusable RGBA VideoFrames."""
+
+import asyncio
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+from livekit import rtc
+
+logger = logging.getLogger(__name__)
+
+DECODE_WORKERS = 2
+# Decodes allowed in flight before new frames are dropped
+MAX_PENDING_DECODES = 2
+
+
+class _FrameSlot:
+    """One preallocated RGBA buffer, wrapped both as a VideoFrame and as a NumPy view."""
+
+    def __init__(self, width: int, height: int):
+        buf = bytearray(width * height * 4)
+        self.frame = rtc.VideoFrame(
+            width=width,
+            height=height,
+            type=rtc.VideoBufferType.RGBA,
+            data=buf,
+        )
+        self.view = np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 4)
+        # Alpha is never written by the decoder, so set it once
+        self.view[..., 3] = 255
+        self.busy = False
+
+
+class FramePool:
+    """Fixed ring of frame buffers.
+
+    A slot is busy while a decode writes into it, and the most recently published slot stays
+    pinned so keepalive/error paths can re-send it without it being overwritten.
+    """
+
+    def __init__(self, width: int, height: int, size: int):
+        self.width = width
+        self.height = height
+        self._slots = [_FrameSlot(width, height) for _ in range(size)]
+        self._next = 0
+        self._published: _FrameSlot | None = None
+
+    def acquire(self) -> _FrameSlot | None:
+        """Return the next free slot, or None if every slot is busy or pinned."""
+        for _ in range(len(self._slots)):
+            slot = self._slots[self._next]
+            self._next = (self._next + 1) % len(self._slots)
+            if not slot.busy and slot is not self._published:
+                slot.busy = True
+                return slot
+        return None
+
+    def release(self, slot: _FrameSlot):
+        slot.busy = False
+
+    def publish(self, slot: _FrameSlot):
+        """Mark a decoded slot as the current frame (unpins the previous one)."""
+        slot.busy = False
+        self._published = slot
+
+
+class FrameDecoder:
+    """Decodes JPEG bytes on a dedicated thread pool into a FramePool.
+
+    At most max_pending decodes run at once; decode() returns None for frames that were
+    dropped, either because the stage was full or because a newer frame finished first.
+    """
+
+    def __init__(self, width: int, height: int,
+                 workers: int = DECODE_WORKERS, max_pending: int = MAX_PENDING_DECODES):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-decode")
+        self._max_pending = max_pending
+        # In-flight slots + the pinned published slot + one spare
+        self._pool = FramePool(width, height, max_pending + 2)
+        self._pending = 0
+        self._seq = 0
+        self._published_seq = 0
+        self.decoded = 0
+        self.dropped = 0
+
+    @property
+    def frame_size(self) -> tuple[int, int]:
+        return self._pool.width, self._pool.height
+
+    def resize(self, width: int, height: int):
+        """Switch output frame size. Decodes already in flight finish into their old slots."""
+        if (width, height) != self.frame_size:
+            self._pool = FramePool(width, height, self._max_pending + 2)
+
+    @property
+    def busy(self) -> bool:
+        return self._pending >= self._max_pending
+
+    def note_dropped(self):
+        """Count a frame the caller discarded before it reached the decoder."""
+        self.dropped += 1
+
+    async def decode(self, jpeg_bytes: bytes) -> rtc.VideoFrame | None:
+        if self.busy:
+            self.dropped += 1
+            return None
+        slot = self._pool.acquire()
+        if slot is None:
+            self.dropped += 1
+            return None
+
+        self._seq += 1
+        seq = self._seq
+        self._pending += 1
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._decode_into, jpeg_bytes, slot.view)
+        except Exception:
+            self._pool.release(slot)
+            raise
+        finally:
+            self._pending -= 1
+
+        if seq < self._published_seq:
+            # A newer frame already went out — publishing this one would step back in time
+            self._pool.release(slot)
+            self.dropped += 1
+            return None
+        self._published_seq = seq
+        self._pool.publish(slot)
+        self.decoded += 1
+        return slot.frame
+
+    async def decode_region(self, jpeg_bytes: bytes, view: np.ndarray):
+        """Decode a JPEG into an arbitrary (possibly strided) RGBA view on the decode pool."""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self._executor, self._decode_into, jpeg_bytes, view)
+
+    @staticmethod
+    def _decode_into(jpeg_bytes: bytes, view: np.ndarray):
+        """CPU-bound: decode JPEG and write RGB into the slot's RGBA buffer. Runs in the decode pool."""
+        height, width = view.shape[:2]
+        img = Image.open(io.BytesIO(jpeg_bytes))
+        if img.size != (width, height):
+            # Let libjpeg scale in the DCT domain when the capture is larger than the frame
+            img.draft("RGB", (width, height))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        if img.size != (width, height):
+            img = img.resize((width, height))
+        view[..., :3] = np.asarray(img)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FrameCompositor:
+    """A single persistent frame that damaged regions are decoded into in place.
+
+    Used by damage-region capture: only changed rectangles are captured, and each one is
+    pasted into this frame, so per-frame work scales with the changed area.
+    """
+
+    def __init__(self, decoder: FrameDecoder):
+        self._decoder = decoder
+        self._slot: _FrameSlot | None = None
+
+    @property
+    def frame(self) -> rtc.VideoFrame | None:
+        return self._slot.frame if self._slot else None
+
+    @property
+    def needs_full_frame(self) -> bool:
+        """True until a full frame has been pasted at the decoder's current frame size."""
+        return self._slot is None or (self._slot.frame.width, self._slot.frame.height) != self._decoder.frame_size
+
+    async def paste(self, jpeg_bytes: bytes, x: int, y: int, width: int, height: int):
+        """Decode a captured region into the frame at (x, y), in frame pixels."""
+        if self.needs_full_frame:
+            self._slot = _FrameSlot(*self._decoder.frame_size)
+        frame_w, frame_h = self._decoder.frame_size
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(frame_w, x + width), min(frame_h, y + height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        await self._decoder.decode_region(jpeg_bytes, self._slot.view[y0:y1, x0:x1])
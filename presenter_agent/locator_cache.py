@@ -0,0 +1,62 @@
+"""Locator cache — resolved elements reused while the page's DOM is unchanged.
+
+The presenter often highlights an element, talks about it, then clicks the same text. Entries
+are keyed by selector text and tagged with the in-page DOM version they were resolved at; any
+observed DOM mutation (or a navigation) makes them stale.
+"""
+
+from collections import OrderedDict
+
+MAX_ENTRIES = 64
+
+
+class LocatorCache:
+    """Per-page cache of element refs keyed by selector text.
+
+    The ref is the element's data-demo-ref value, so an in-page script can find the element
+    directly instead of re-running the resolver (and re-checks that it is still visible).
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self.dom_version = -1
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self):
+        """Drop every entry (new document)."""
+        self._entries.clear()
+        self.dom_version = -1
+
+    def note_dom_version(self, version: int):
+        """Record the latest DOM version reported by the page (versions only move forward)."""
+        self.dom_version = max(self.dom_version, version)
+
+    def get(self, selector: str) -> str | None:
+        """Return the ref if the selector was resolved at the current DOM version."""
+        entry = self._entries.get(selector)
+        if entry is None or entry[1] != self.dom_version:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(selector)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, selector: str, ref: str, version: int):
+        """Store a resolution made at DOM version `version`."""
+        self.note_dom_version(version)
+        self._entries[selector] = (ref, version)
+        self._entries.move_to_end(selector)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "dom_version": self.dom_version,
+        }
@@ -1,16 +1,29 @@
 """Screen share module — captures Playwright browser and publishes as LiveKit video track."""
 
 import asyncio
-import io
+import base64
+import hashlib
 import logging
 import re
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
 
-import numpy as np
-from PIL import Image
-from playwright.async_api import async_playwright, Page, Browser, Locator
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from livekit import rtc
 
+from backend.json_logger import setup_json_logger, log_event
+from backend.page_settle import PageSettle
+from presenter_agent.action_queue import ActionQueue
+from presenter_agent.browser_pool import BrowserPool, PooledBrowser, SharedChromium
+from presenter_agent.capture_controller import AdaptiveCaptureController
+from presenter_agent.capture_stats import CaptureMetrics, FrameScheduler, RollingWindow
+from presenter_agent.frame_decoder import FrameCompositor, FrameDecoder
+from presenter_agent.locator_cache import LocatorCache
+from presenter_agent.spatial_index import SpatialIndex
+
 logger = logging.getLogger(__name__)
+json_logger = setup_json_logger("presenter.screen_share", "presenter.log")
 
 
 def sanitize_selector(selector: str) -> str:
@@ -63,15 +76,170 @@ def _extract_aria_label(selector: str) -> str | None:
         return m.group(1)
     return None
 
+
+def _url_origin(url: str) -> str:
+    """scheme://host[:port] of a URL (sessionStorage is scoped to this)."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _monotonic_us(loop_time: float) -> int:
+    """Convert event-loop (monotonic) seconds to capture_frame microseconds."""
+    return int(loop_time * 1_000_000)
+
+
+def _merge_damage_rects(rects: list, width: int, height: int) -> list[tuple[int, int, int, int]]:
+    """Clip damage rects to the viewport and merge ones that overlap or nearly touch.
+
+    Rects are [x0, y0, x1, y1] in CSS pixels. Returns integer rects covering all damage.
+    """
+    boxes = []
+    for x0, y0, x1, y1 in rects:
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(width, int(x1) + 1), min(height, int(y1) + 1)
+        if x1 > x0 and y1 > y0:
+            boxes.append([x0, y0, x1, y1])
+
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        for box in boxes:
+            for other in out:
+                if (box[0] <= other[2] + DAMAGE_MERGE_GAP and other[0] <= box[2] + DAMAGE_MERGE_GAP
+                        and box[1] <= other[3] + DAMAGE_MERGE_GAP and other[1] <= box[3] + DAMAGE_MERGE_GAP):
+                    other[0], other[1] = min(other[0], box[0]), min(other[1], box[1])
+                    other[2], other[3] = max(other[2], box[2]), max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                out.append(box)
+        boxes = out
+    return [tuple(b) for b in boxes]
+
+
 VIEWPORT_WIDTH = 1280
 VIEWPORT_HEIGHT = 720
-TARGET_FPS = 30
+# FPS, capture scale and JPEG quality come from the adaptive controller's current tier
+# (see capture_controller.CAPTURE_TIERS).
+# Chrome composites at ~60 Hz; screencast everyNthFrame is derived from this
+COMPOSITOR_FPS = 60
+
+# Capture backends:
+# - "screenshot": poll Page.captureScreenshot at the current tier's FPS (request/response per frame)
+# - "screencast": Chrome pushes frames over CDP (Page.startScreencast) whenever the page repaints
+# - "damage": an in-page tracker reports changed regions; only those are captured and
+#   composited into a persistent frame
+CAPTURE_MODE_SCREENSHOT = "screenshot"
+CAPTURE_MODE_SCREENCAST = "screencast"
+CAPTURE_MODE_DAMAGE = "damage"
+CAPTURE_MODES = (CAPTURE_MODE_SCREENSHOT, CAPTURE_MODE_SCREENCAST, CAPTURE_MODE_DAMAGE)
+
+# Log a warning when a single tool action stalls capture for longer than this
+CAPTURE_BLOCKED_WARN_MS = 100
+
+# Unchanged frames are not decoded or pushed. While the page is static, re-send the last
+# frame at this interval so late subscribers still get a keyframe.
+KEEPALIVE_INTERVAL = 0.5
+
+# Shown on the published track until the first page frame is captured (blank-page grey)
+PLACEHOLDER_RGBA = (248, 249, 250, 255)
+# How long start() waits for the first real frame before returning anyway
+FIRST_FRAME_TIMEOUT = 5.0
+
+# Idle mode: after this many identical captures in a row, poll at IDLE_FPS instead of
+# the tier FPS until the page changes or one of our own actions wakes the capture loop.
+IDLE_AFTER_UNCHANGED_FRAMES = 15
+IDLE_FPS = 4
+
+# Damage mode: fall back to a full capture when the damaged area exceeds this fraction of the
+# viewport or there are too many separate rects, and refresh the whole frame at least this
+# often to pick up paints the in-page tracker cannot see (canvas, cross-origin iframes).
+DAMAGE_FULL_FRACTION = 0.5
+MAX_DAMAGE_RECTS = 8
+DAMAGE_MERGE_GAP = 16
+FULL_REFRESH_INTERVAL = 1.0
+
+# How often per-stage capture metrics are written to the presenter log
+METRICS_INTERVAL = 10.0
+# JS heap of one session's page above which the metrics report flags it (shared browsers)
+CONTEXT_HEAP_WARN_MB = 512
+
+# In-page damage tracker for damage capture mode, installed as an init script so it runs in
+# every document. Records viewport rects of mutated elements, running CSS animations and
+# playing videos; our own cursor and scroll helpers report their damage explicitly.
+# drain() returns {full, rects: [[x0, y0, x1, y1], ...], scrollX, scrollY} and resets.
+DAMAGE_TRACKER_JS = """
+(() => {
+    if (window.top !== window || window.__demoDamage) return;
+    const PAD = 8;  // covers outlines/shadows drawn outside the element box
+    let rects = [];
+    let full = true;  // first drain after a navigation is always a full frame
+
+    function markBox(r) {
+        if (r.width <= 0 || r.height <= 0) return;
+        rects.push([r.left - PAD, r.top - PAD, r.right + PAD, r.bottom + PAD]);
+        if (rects.length > 256) full = true;
+    }
+
+    window.__demoDamage = {
+        markRect(x, y, w, h) { rects.push([x, y, x + w, y + h]); },
+        markElement(el) { if (el && el.getBoundingClientRect) markBox(el.getBoundingClientRect()); },
+        markFull() { full = true; },
+        drain() {
+            if (!full) {
+                for (const anim of document.getAnimations()) {
+                    if (anim.playState === 'running' && anim.effect && anim.effect.target) {
+                        this.markElement(anim.effect.target);
+                    }
+                }
+                for (const video of document.querySelectorAll('video')) {
+                    if (!video.paused) this.markElement(video);
+                }
+            }
+            const out = {full, rects: full ? [] : rects, scrollX: window.scrollX, scrollY: window.scrollY};
+            rects = [];
+            full = false;
+            return out;
+        },
+    };
 
-# JavaScript to inject a custom cursor overlay and smooth movement animation.
-# Takes [initX, initY] as argument so cursor resumes at stored position after navigation.
-CURSOR_INJECT_JS = """
-([initX, initY]) => {
-    if (document.getElementById('__demo_cursor')) return;
+    const REF_ATTR = 'data-demo-ref';
+    new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            const el = m.target.nodeType === 1 ? m.target : m.target.parentElement;
+            if (!el || el.id === '__demo_cursor') continue;
+            // Element handles from the resolver do not change what is on screen
+            if (m.attributeName === REF_ATTR) continue;
+            window.__demoDamage.markElement(el);
+        }
+    }).observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+
+    addEventListener('scroll', () => { full = true; }, {passive: true, capture: true});
+    addEventListener('resize', () => { full = true; });
+})();
+"""
+
+# Custom cursor overlay plus the smooth scroll/move helpers, installed as a context init script
+# so every top-level document has them before its first paint. The cursor mounts on <html>
+# (body does not exist yet when init scripts run) and re-mounts if the page removes it. Its
+# position is kept in sessionStorage, so it resumes where it was after same-origin navigations;
+# after a cross-origin navigation Python re-places it with __placeCursor(x, y).
+CURSOR_INIT_JS = """
+(() => {
+    if (window.top !== window || window.__moveCursorTo) return;
+    const STORAGE_KEY = '__demoCursor';
+
+    let saved = null;
+    try { saved = JSON.parse(sessionStorage.getItem(STORAGE_KEY)); } catch (e) {}
+    window.__cursorX = saved ? saved.x : innerWidth / 2;
+    window.__cursorY = saved ? saved.y : innerHeight / 2;
+
+    function savePosition() {
+        try {
+            sessionStorage.setItem(STORAGE_KEY, JSON.stringify({x: window.__cursorX, y: window.__cursorY}));
+        } catch (e) {}
+    }
 
     const cursor = document.createElement('div');
     cursor.id = '__demo_cursor';
@@ -89,32 +257,61 @@ CURSOR_INJECT_JS = """
         z-index: 2147483647;
         pointer-events: none;
         transition: none;
-        transform: translate(${initX}px, ${initY}px);
+        transform: translate(${window.__cursorX}px, ${window.__cursorY}px);
         filter: drop-shadow(2px 3px 3px rgba(0,0,0,0.5));
     `;
-    document.body.appendChild(cursor);
 
-    // Store current position (passed from Python-side state)
-    window.__cursorX = initX;
-    window.__cursorY = initY;
+    function mount() {
+        if (!cursor.isConnected && document.documentElement) document.documentElement.appendChild(cursor);
+    }
+    mount();
+    if (!cursor.isConnected) {
+        // documentElement is not created yet
+        new MutationObserver((_, observer) => {
+            if (document.documentElement) { mount(); observer.disconnect(); }
+        }).observe(document, {childList: true});
+    }
+    // Frameworks that rewrite the document can drop the overlay
+    document.addEventListener('DOMContentLoaded', mount);
+    addEventListener('load', mount);
+
+    window.__placeCursor = (x, y) => {
+        mount();
+        if (window.__demoDamage) {
+            window.__demoDamage.markRect(window.__cursorX - 4, window.__cursorY - 4, 44, 44);
+            window.__demoDamage.markRect(x - 4, y - 4, 44, 44);
+        }
+        cursor.style.transform = `translate(${x}px, ${y}px)`;
+        window.__cursorX = x;
+        window.__cursorY = y;
+        savePosition();
+    };
 
     // Smooth scroll function using requestAnimationFrame
     window.__smoothScrollBy = (deltaY, durationMs) => {
-        const startY = window.scrollY;
-        const startTime = performance.now();
-        function ease(t) {
-            return t < 0.5 ? 4 * t * t * t : 1 - Math.pow(-2 * t + 2, 3) / 2;
-        }
-        function step(now) {
-            const progress = Math.min((now - startTime) / durationMs, 1);
-            window.scrollTo(0, startY + deltaY * ease(progress));
-            if (progress < 1) requestAnimationFrame(step);
-        }
-        requestAnimationFrame(step);
+        return new Promise(resolve => {
+            const startY = window.scrollY;
+            const startTime = performance.now();
+            function ease(t) {
+                return t < 0.5 ? 4 * t * t * t : 1 - Math.pow(-2 * t + 2, 3) / 2;
+            }
+            function step(now) {
+                const progress = Math.min((now - startTime) / durationMs, 1);
+                if (window.__demoDamage) window.__demoDamage.markFull();
+                window.scrollTo(0, startY + deltaY * ease(progress));
+                if (progress < 1) {
+                    requestAnimationFrame(step);
+                } else {
+                    resolve();
+                }
+            }
+            requestAnimationFrame(step);
+        });
     };
 
     // Smooth move function using requestAnimationFrame
     window.__moveCursorTo = (targetX, targetY, durationMs) => {
+        mount();
         return new Promise(resolve => {
             const startX = window.__cursorX;
             const startY = window.__cursorY;
@@ -132,6 +329,11 @@ CURSOR_INJECT_JS = """
                 const x = startX + (targetX - startX) * eased;
                 const y = startY + (targetY - startY) * eased;
 
+                if (window.__demoDamage) {
+                    // cursor box plus its drop shadow, at the old and new position
+                    window.__demoDamage.markRect(window.__cursorX - 4, window.__cursorY - 4, 44, 44);
+                    window.__demoDamage.markRect(x - 4, y - 4, 44, 44);
+                }
                 cursor.style.transform = `translate(${x}px, ${y}px)`;
                 window.__cursorX = x;
                 window.__cursorY = y;
@@ -139,352 +341,1520 @@ CURSOR_INJECT_JS = """
                 if (progress < 1) {
                     requestAnimationFrame(animate);
                 } else {
+                    savePosition();
                     resolve();
                 }
             }
             requestAnimationFrame(animate);
         });
     };
+})();
+"""
+
+# Attribute the resolver stamps on the matched element, so a Locator can target it directly
+ELEMENT_REF_ATTR = "data-demo-ref"
+# Upper bound for one resolver round trip
+RESOLVE_TIMEOUT = 3.0
+
+# JavaScript that resolves an LLM-supplied selector to one visible element in a single pass.
+# Tiers, in priority order (the first tier with a visible match wins, earliest in DOM order):
+#   role_link / role_button / role_menuitem / role_tab — accessible name contains the query
+#   exact_text      — normalized text equals the query (case-sensitive)
+#   substring_text  — normalized text contains the query (case-insensitive)
+#   css             — document.querySelectorAll(css)
+#   extracted_text  — text pulled out of :has-text()/:contains()/text= contains it
+#   aria_label      — aria-label or <label> text contains the label
+# Text tiers match the innermost element containing the text, like Playwright's get_by_text.
+ELEMENT_RESOLVER_JS = """
+({query, css, text, label}) => {
+    const REF_ATTR = '%s';
+    const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+    const lower = (s) => norm(s).toLowerCase();
+
+    function isVisible(el) {
+        const r = el.getBoundingClientRect();
+        if (r.width <= 0 || r.height <= 0) return false;
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    }
+
+    function accessibleName(el) {
+        const labelledBy = el.getAttribute('aria-labelledby');
+        if (labelledBy) {
+            const names = labelledBy.split(/\\s+/).map(id => document.getElementById(id)).filter(Boolean);
+            if (names.length) return norm(names.map(n => n.textContent).join(' '));
+        }
+        return norm(
+            el.getAttribute('aria-label') || el.textContent || el.getAttribute('title')
+            || el.getAttribute('alt') || el.value || ''
+        );
+    }
+
+    const ROLE_SELECTORS = {
+        link: 'a[href], area[href], [role="link"]',
+        button: 'button, input[type="button"], input[type="submit"], input[type="reset"], input[type="image"], [role="button"]',
+        menuitem: '[role="menuitem"]',
+        tab: '[role="tab"]',
+    };
+
+    function byRole(role, name) {
+        const needle = name.toLowerCase();
+        const out = [];
+        for (const el of document.querySelectorAll(ROLE_SELECTORS[role])) {
+            const explicit = el.getAttribute('role');
+            if (explicit && explicit !== role) continue;
+            if (accessibleName(el).toLowerCase().includes(needle)) out.push(el);
+        }
+        return out;
+    }
+
+    // Innermost elements whose text satisfies match; only descends into elements containing it
+    function byText(contains, match) {
+        const out = [];
+        (function walk(el) {
+            let childMatched = false;
+            for (const child of el.children) {
+                if (child.tagName === 'SCRIPT' || child.tagName === 'STYLE' || child.id === '__demo_cursor') continue;
+                if (contains(child.textContent) && walk(child)) childMatched = true;
+            }
+            if (!childMatched && el !== document.body && match(el.textContent)) {
+                out.push(el);
+                return true;
+            }
+            return childMatched;
+        })(document.body);
+        return out;
+    }
+
+    function byLabel(value) {
+        const needle = value.toLowerCase();
+        const out = [];
+        for (const el of document.querySelectorAll('[aria-label]')) {
+            if (lower(el.getAttribute('aria-label')).includes(needle)) out.push(el);
+        }
+        for (const lab of document.querySelectorAll('label')) {
+            if (!lower(lab.textContent).includes(needle)) continue;
+            const target = lab.control || lab.querySelector('input, select, textarea, button');
+            if (target) out.push(target);
+        }
+        return out;
+    }
+
+    const tiers = [];
+    if (query) {
+        for (const role of ['link', 'button', 'menuitem', 'tab']) {
+            tiers.push(['role_' + role, () => byRole(role, query)]);
+        }
+        const exact = norm(query);
+        tiers.push(['exact_text', () => byText(t => norm(t).includes(exact), t => norm(t) === exact)]);
+        const sub = lower(query);
+        tiers.push(['substring_text', () => byText(t => lower(t).includes(sub), t => lower(t).includes(sub))]);
+    }
+    if (css) {
+        tiers.push(['css', () => {
+            try { return Array.from(document.querySelectorAll(css)); }
+            catch (e) { return []; }  // Playwright-only syntax; covered by extracted_text
+        }]);
+    }
+    if (text) {
+        const sub = lower(text);
+        tiers.push(['extracted_text', () => byText(t => lower(t).includes(sub), t => lower(t).includes(sub))]);
+    }
+    if (label) {
+        tiers.push(['aria_label', () => byLabel(label)]);
+    }
+
+    for (const [strategy, find] of tiers) {
+        const matches = find();
+        const el = matches.find(isVisible);
+        if (!el) continue;
+        if (!el.hasAttribute(REF_ATTR)) {
+            window.__demoRefSeq = (window.__demoRefSeq || 0) + 1;
+            el.setAttribute(REF_ATTR, String(window.__demoRefSeq));
+        }
+        return {ref: el.getAttribute(REF_ATTR), strategy, matches: matches.length};
+    }
+    return null;
+}
+""" % ELEMENT_REF_ATTR
+
+# Timing of the fused action steps (ms)
+MAX_SCROLL_MS = 1200
+CLICK_MOVE_MS = 700
+POINT_MOVE_MS = 600
+HIGHLIGHT_MS = 3000
+# Upper bound on waiting for a page to settle after a click (s); the viewer is watching
+CLICK_SETTLE_CEILING = 3.0
+
+# Fused in-page action runner: resolves the target (reusing a cached ref when it still points
+# at a visible element, otherwise running ELEMENT_RESOLVER_JS) and plays a step sequence on it
+# in one evaluate, resolving when the whole choreography is done. Steps:
+#   {"action": "scroll", "mode": "center"}  — smooth-scroll the element to the viewport center
+#                                            (skipped when already within 50px)
+#   {"action": "scroll", "mode": "reveal"}  — same, but only when it is not fully in view
+#   {"action": "move", "duration": ms}      — animate the cursor to the element's center
+#   {"action": "highlight", "duration": ms} — outline the element for duration
+# Returns null when nothing matched, else the match plus the element's final box, whether the
+# element is topmost at its center (hit), and the DOM version for the locator cache.
+# Clicking stays in Python so it is a trusted input event.
+ACTION_RUNNER_JS = """
+async ({resolve, ref, steps}) => {
+    const REF_ATTR = '%(ref_attr)s';
+    const resolveElement = %(resolver)s;
+
+    let el = ref ? document.querySelector(`[${REF_ATTR}="${ref}"]`) : null;
+    let match;
+    if (el && el.getClientRects().length) {
+        match = {strategy: 'cached', matches: 1};
+    } else {
+        match = resolveElement(resolve);
+        if (!match) return null;
+        el = document.querySelector(`[${REF_ATTR}="${match.ref}"]`);
+    }
+
+    const rect = () => el.getBoundingClientRect();
+    const markOutline = () => {
+        if (!window.__demoDamage) return;
+        const r = rect();
+        window.__demoDamage.markRect(r.x - 6, r.y - 6, r.width + 12, r.height + 12);
+    };
+
+    for (const step of steps) {
+        if (step.action === 'scroll') {
+            const r = rect();
+            const delta = r.y + r.height / 2 - innerHeight / 2;
+            const needed = step.mode === 'reveal'
+                ? (r.top < 0 || r.bottom > innerHeight)
+                : Math.abs(delta) > 50;
+            if (needed && window.__smoothScrollBy) {
+                await window.__smoothScrollBy(delta, Math.max(400, Math.min(%(max_scroll_ms)d, Math.abs(delta) * 2)));
+            }
+        } else if (step.action === 'move') {
+            const r = rect();
+            if (window.__moveCursorTo) {
+                await window.__moveCursorTo(r.x + r.width / 2, r.y + r.height / 2, step.duration);
+            }
+        } else if (step.action === 'highlight') {
+            el.style.outline = '3px solid #FF6B00';
+            el.style.outlineOffset = '2px';
+            markOutline();
+            setTimeout(() => {
+                markOutline();
+                el.style.outline = '';
+                el.style.outlineOffset = '';
+            }, step.duration);
+        }
+    }
+
+    const r = rect();
+    const cx = r.x + r.width / 2, cy = r.y + r.height / 2;
+    const top = document.elementFromPoint(cx, cy);
+    return {
+        ref: el.getAttribute(REF_ATTR),
+        strategy: match.strategy,
+        matches: match.matches,
+        box: {x: r.x, y: r.y, width: r.width, height: r.height},
+        hit: !!top && (top === el || el.contains(top)),
+        domVersion: window.__demoDomVersion ?? null,
+    };
 }
+""" % {"ref_attr": ELEMENT_REF_ATTR, "resolver": ELEMENT_RESOLVER_JS.strip(), "max_scroll_ms": MAX_SCROLL_MS}
+
+
+# DOM version counter for the locator cache, installed as an init script in every document.
+# Bumps window.__demoDomVersion on any mutation except our own overlay work (cursor, element
+# refs, highlight outlines on referenced elements) and reports {version, scrollX, scrollY} to
+# the __demoDomChanged binding at most once per task. Scrolling inner containers moves elements
+# without a mutation, so it bumps the version too.
+DOM_VERSION_JS = """
+(() => {
+    if (window.top !== window || window.__demoDomVersion !== undefined) return;
+    const REF_ATTR = '%s';
+    window.__demoDomVersion = 0;
+    let scheduled = false;
+    function report() {
+        scheduled = false;
+        if (window.__demoDomChanged) {
+            window.__demoDomChanged({version: window.__demoDomVersion, scrollX, scrollY}).catch(() => {});
+        }
+    }
+    function schedule() {
+        if (!scheduled) { scheduled = true; setTimeout(report, 0); }
+    }
+    function ignored(m) {
+        const el = m.target.nodeType === 1 ? m.target : m.target.parentElement;
+        if (!el || el.closest('#__demo_cursor')) return true;
+        if (m.type === 'childList') {
+            return [...m.addedNodes, ...m.removedNodes].every(n => n.id === '__demo_cursor');
+        }
+        if (m.type === 'attributes') {
+            return m.attributeName === REF_ATTR || (m.attributeName === 'style' && el.hasAttribute(REF_ATTR));
+        }
+        return false;
+    }
+    new MutationObserver((mutations) => {
+        if (mutations.some(m => !ignored(m))) {
+            window.__demoDomVersion++;
+            schedule();
+        }
+    }).observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    addEventListener('scroll', (e) => {
+        if (e.target !== document) window.__demoDomVersion++;
+        schedule();
+    }, {passive: true, capture: true});
+})();
+""" % ELEMENT_REF_ATTR
+
+
+# Persistent registry of interactive elements (links, buttons, inputs), installed as an init
+# script and built once per document. A MutationObserver marks added subtrees and changed
+# elements dirty; the registry re-reads only those on the next query, so the ancestor climb for
+# nav membership and innerText run once per element instead of on every scan. Visibility is
+# layout-dependent, so it is checked per registered element at query time, which also measures
+# each visible element's box.
+# query(docId, since) returns entries changed after version `since` (all of them when docId
+# does not match this document), ids removed since then, the visible ids in DOM order (null
+# when unchanged since the previous query), and [id, x, y, width, height, pinned] for visible
+# elements whose box changed. Boxes are in document coordinates, or viewport coordinates for
+# pinned elements (inside fixed/sticky containers).
+INTERACTIVE_REGISTRY_JS = """
+(() => {
+    if (window.top !== window || window.__demoRegistry) return;
+    const LINK = 'a[href]';
+    const BUTTON = 'button, [role="button"], input[type="submit"], input[type="button"]';
+    const INPUT = 'input[type="text"], input[type="email"], input[type="search"], textarea';
+    const ALL = [LINK, BUTTON, INPUT].join(', ');
+    // Flush early when this many elements are waiting, and drop tombstones past this count
+    const MAX_DIRTY = 200;
+    const MAX_TOMBSTONES = 1000;
+
+    const docId = Math.random().toString(36).slice(2);
+    const entries = new Map();  // Element -> {id, json, rec, v, pinned, boxKey}
+    let removed = [];           // [id, version] not yet acknowledged by the client
+    let version = 0, nextId = 1, floor = 0, lastServed = -1;
+    let built = false, order = null, sweep = false, lastVisibleKey = null;
+    const dirty = new Set();
+    const dirtyRoots = new Set();
+
+    // Whether an element sits in a fixed/sticky container, memoized per flush
+    let pinnedMemo = new Map();
+    function isPinned(node) {
+        if (!node || node.nodeType !== 1) return false;
+        if (pinnedMemo.has(node)) return pinnedMemo.get(node);
+        const pos = getComputedStyle(node).position;
+        const pinned = pos === 'fixed' || pos === 'sticky' || isPinned(node.parentElement);
+        pinnedMemo.set(node, pinned);
+        return pinned;
+    }
+
+    function isInNav(el) {
+        for (let node = el; node; node = node.parentElement) {
+            if (node.tagName === 'NAV') return true;
+            if (node.getAttribute && node.getAttribute('role') === 'navigation') return true;
+        }
+        return false;
+    }
+
+    function read(el) {
+        const rec = {link: null, button: null, input: null};
+        const aria = el.getAttribute('aria-label') || null;
+        if (el.matches(LINK)) {
+            const text = (el.innerText || aria || '').trim();
+            if (text) {
+                rec.link = {
+                    text: text.substring(0, 80),
+                    href: el.href,
+                    path: new URL(el.href, location.origin).pathname,
+                    aria_label: aria,
+                    nav: isInNav(el),
+                };
+            }
+        }
+        if (el.matches(BUTTON)) {
+            const text = (el.innerText || el.value || aria || '').trim();
+            if (text) rec.button = {text: text.substring(0, 80), aria_label: aria};
+        }
+        if (el.matches(INPUT)) {
+            const label = aria || el.getAttribute('placeholder') || '';
+            if (label) rec.input = {text: label.substring(0, 80)};
+        }
+        return rec;
+    }
+
+    function drop(el) {
+        const old = entries.get(el);
+        if (!old) return;
+        entries.delete(el);
+        version++;
+        removed.push([old.id, version]);
+        order = null;
+    }
+
+    function refresh(el) {
+        if (!el.isConnected || !el.matches(ALL)) { drop(el); return; }
+        const rec = read(el);
+        const json = JSON.stringify(rec);
+        const old = entries.get(el);
+        const pinned = isPinned(el);
+        if (old && old.json === json) {
+            if (old.pinned !== pinned) { old.pinned = pinned; old.boxKey = null; }
+            return;
+        }
+        version++;
+        if (!old) order = null;
+        entries.set(el, {id: old ? old.id : nextId++, json, rec, v: version, pinned, boxKey: null});
+    }
+
+    function scan(root) {
+        if (root.matches && root.matches(ALL)) refresh(root);
+        for (const el of root.querySelectorAll(ALL)) refresh(el);
+    }
+
+    function flush() {
+        pinnedMemo = new Map();
+        if (!built) {
+            built = true;
+            dirty.clear();
+            dirtyRoots.clear();
+            scan(document);
+            return;
+        }
+        if (sweep) {
+            sweep = false;
+            for (const el of [...entries.keys()]) if (!el.isConnected) drop(el);
+        }
+        if (dirtyRoots.size) order = null;
+        for (const root of dirtyRoots) if (root.isConnected) scan(root);
+        for (const el of dirty) refresh(el);
+        dirtyRoots.clear();
+        dirty.clear();
+        if (removed.length > MAX_TOMBSTONES) {
+            // Client fell too far behind; its next query gets a full snapshot
+            removed = [];
+            floor = version;
+        }
+    }
+
+    new MutationObserver((mutations) => {
+        if (!built) return;
+        for (const m of mutations) {
+            const target = m.target.nodeType === 1 ? m.target : m.target.parentElement;
+            if (!target || target.closest('#__demo_cursor')) continue;
+            if (m.type === 'attributes') {
+                // role can change nav membership of a whole subtree
+                if (m.attributeName === 'role') dirtyRoots.add(target);
+                else if (entries.has(target) || target.matches(ALL)) dirty.add(target);
+                continue;
+            }
+            if (m.type === 'childList') {
+                if (m.removedNodes.length) sweep = true;
+                for (const n of m.addedNodes) {
+                    if (n.nodeType === 1 && n.id !== '__demo_cursor') dirtyRoots.add(n);
+                }
+            }
+            // Text inside a registered element changed
+            const owner = target.closest(ALL);
+            if (owner) dirty.add(owner);
+        }
+        if (dirty.size + dirtyRoots.size > MAX_DIRTY) flush();
+    }).observe(document, {
+        subtree: true, childList: true, characterData: true, attributes: true,
+        attributeFilter: ['href', 'role', 'type', 'aria-label', 'placeholder', 'value'],
+    });
+
+    // Build while the page is idle after load so the first page guide does not pay for it
+    addEventListener('load', () => (window.requestIdleCallback || setTimeout)(() => flush()));
+
+    window.__demoRegistry = {
+        query(clientDocId, since) {
+            flush();
+            const reset = clientDocId !== docId || since < floor;
+            if (!reset) {
+                // The client has applied everything up to since
+                removed = removed.filter(([, v]) => v > since);
+                floor = since;
+            }
+            const upserts = [];
+            for (const e of entries.values()) {
+                if (reset || e.v > since) upserts.push({id: e.id, ...e.rec});
+            }
+            if (!order) {
+                order = [...entries.keys()].sort(
+                    (a, b) => (a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING) ? -1 : 1
+                );
+            }
+            const resend = reset || since !== lastServed;
+            const visible = [];
+            const boxes = [];
+            for (const el of order) {
+                const e = entries.get(el);
+                if (!e || !(e.rec.link || e.rec.button || e.rec.input)) continue;
+                // The client drops hidden elements from its index, so their box is resent
+                // once they reappear
+                if (!el.offsetParent && el.tagName !== 'BODY') { e.boxKey = null; continue; }
+                const r = el.getBoundingClientRect();
+                if (r.width <= 0 || r.height <= 0) { e.boxKey = null; continue; }
+                visible.push(e.id);
+                const box = e.pinned
+                    ? [r.x, r.y, r.width, r.height]
+                    : [r.x + scrollX, r.y + scrollY, r.width, r.height];
+                const boxKey = box.map(Math.round).join(',');
+                if (resend || boxKey !== e.boxKey) {
+                    e.boxKey = boxKey;
+                    boxes.push([e.id, ...box, e.pinned]);
+                }
+            }
+            const key = visible.join(',');
+            const visibleChanged = resend || key !== lastVisibleKey;
+            lastVisibleKey = key;
+            lastServed = version;
+            return {
+                docId, version, reset, upserts,
+                removed: reset ? [] : removed.map(([id]) => id),
+                visible: visibleChanged ? visible : null,
+                boxes, scrollX, scrollY,
+                domVersion: window.__demoDomVersion ?? null,
+            };
+        },
+    };
+})();
 """
 
 
 class BrowserScreenShare:
     """Manages a headless browser and publishes its screen as a LiveKit video track."""
 
-    def __init__(self):
+    def __init__(self, capture_mode: str = CAPTURE_MODE_SCREENSHOT,
+                 best_tier: str = "full", worst_tier: str = "minimal",
+                 browser_pool: BrowserPool | SharedChromium | None = None):
+        """
+        Args:
+            capture_mode: "screenshot" (polling), "screencast" (CDP push) or "damage"
+                (changed regions only, composited into a persistent frame).
+            best_tier / worst_tier: bounds for the adaptive quality controller. Pass the same
+                tier name for both to pin capture settings.
+            browser_pool: prewarmed browsers to lease instead of launching one (falls back to
+                a launch when the pool is empty), or a SharedChromium to run this session as one
+                BrowserContext in a browser shared with other sessions.
+        """
+        if capture_mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode '{capture_mode}', expected one of {CAPTURE_MODES}")
+        self._capture_mode = capture_mode
+        self._room_id: str | None = None
+        self._controller = AdaptiveCaptureController(best_tier, worst_tier)
         self._playwright = None
         self._browser: Browser | None = None
+        self._browser_pool = browser_pool
+        self._pooled_browser: PooledBrowser | None = None
+        # Crash recovery: the page is rebuilt and reloaded at the last URL
+        self._last_url: str | None = None
+        self._recovery: asyncio.Task | None = None
+        self._stopping = False
+        # Latest Performance.getMetrics sample for this session's page
+        self._resource_usage: dict = {}
+        # Startup: set once the page is open / the first page frame is pushed
+        self._ready = asyncio.Event()
+        self._first_frame = asyncio.Event()
+        self._startup_start: float | None = None
+        self._startup_marks: dict[str, float] = {}
+        self._context: BrowserContext | None = None
         self._page: Page | None = None
+        self._settle: PageSettle | None = None
         self._source: rtc.VideoSource | None = None
         self._running = False
         self._capture_task: asyncio.Task | None = None
+        self._keepalive_task: asyncio.Task | None = None
+        # Damage mode: set while regions are being decoded into the composite frame
+        self._compositing = False
+        # Serializes page interaction (tool actions). Capture never takes this lock — it uses
+        # its own CDP session, so a slow element lookup cannot freeze the shared screen.
         self._page_lock = asyncio.Lock()
+        # Tool-level choreography queue: tools enqueue and return while the action plays out
+        self._actions = ActionQueue()
+        self._capture_session = None
+        self._decoder: FrameDecoder | None = None
+        self._decode_tasks: set[asyncio.Task] = set()
+        # Latest captured (JPEG, timestamp_us) waiting for a free decode slot (newer captures replace it)
+        self._pending_jpeg: tuple[bytes, int] | None = None
+        # Frame pacing: capture ticks on a fixed monotonic grid, explicit frame timestamps
+        self._scheduler = FrameScheduler()
+        self._frame_interval: float = 0.0
+        self._last_timestamp_us = 0
+        self._last_content_timestamp_us = 0
+        self._content_streak = False
+        self._frame_intervals = RollingWindow()
+        # Screencast metadata timestamps are wall-clock; offset to convert them to loop time
+        self._wall_clock_offset: float = 0.0
+        # Duplicate suppression / idle mode
+        self._last_frame_digest: bytes | None = None
+        self._unchanged_frames = 0
+        self._frames_suppressed = 0
+        self._wake_event = asyncio.Event()
         self._last_good_frame: rtc.VideoFrame | None = None
-        # Track cursor position so it persists across page navigations
+        self._last_push_time: float = 0.0
+        # Per-action timing: lock wait/hold and how long capture stalled while the action ran
+        self._action_stats: dict[str, dict] = {}
+        self._action_active = False
+        self._action_last_capture: float = 0.0
+        self._action_max_capture_gap: float = 0.0
+        # Rolling per-stage histograms, reported every METRICS_INTERVAL
+        self._metrics = CaptureMetrics()
+        self._last_metrics_report: float = 0.0
+        # Python mirror of the in-page interactive element registry (see INTERACTIVE_REGISTRY_JS)
+        self._registry_doc: str | None = None
+        self._registry_version = 0
+        self._registry_entries: dict[int, dict] = {}
+        self._registry_visible: list[int] = []
+        self._scan_snapshot: dict | None = None
+        self._scan_snapshot_scroll: tuple[float, float] | None = None
+        # Geometry of the visible registry elements, as of DOM version _element_index_version
+        self._element_index = SpatialIndex(VIEWPORT_WIDTH, VIEWPORT_HEIGHT)
+        self._element_index_version = -1
+        # Resolved elements, reused until the DOM changes or the page navigates
+        self._locator_cache = LocatorCache()
+        # Last cursor target, used to re-place the cursor after cross-origin navigations
+        # (sessionStorage carries it across same-origin ones)
         self._cursor_x: float = VIEWPORT_WIDTH / 2
         self._cursor_y: float = VIEWPORT_HEIGHT / 2
+        self._page_origin: str | None = None
 
     @property
     def page(self) -> Page | None:
         return self._page
 
-    async def _find_element_with_fallback(self, selector: str) -> Locator | None:
-        """Multi-tier fallback to find an element. Caller must hold _page_lock.
-
-        Priority order (most → least reliable):
-        1. Role-based: get_by_role("link"|"button"|"menuitem"|"tab", name=selector)
-        2. Exact text: get_by_text(selector, exact=True)
-        3. Substring text: get_by_text(selector, exact=False)
-        4. CSS selector: page.locator(selector)
-        5. Text extracted from pseudo-selectors: :has-text, :contains, text=
-        6. Aria-label: get_by_label(selector)
-        Returns the first Locator that resolves to a visible element, or None.
-        """
-        if not self._page:
-            return None
+    @property
+    def actions(self) -> ActionQueue:
+        """Serial queue for browser actions submitted by tools (see action_queue)."""
+        return self._actions
 
-        # Tier 1: role-based matching (Playwright's most resilient strategy)
-        for role in ("link", "button", "menuitem", "tab"):
-            try:
-                loc = self._page.get_by_role(role, name=selector)
-                count = await loc.count()
-                if count == 1:
-                    box = await loc.bounding_box(timeout=2000)
-                    if box:
-                        logger.info(f"Found element by role '{role}' name '{selector}'")
-                        return loc
-                elif count > 1:
-                    # Multiple matches — try the first visible one
-                    loc = loc.first
-                    box = await loc.bounding_box(timeout=2000)
-                    if box:
-                        logger.info(f"Found element by role '{role}' name '{selector}' (first of {count})")
-                        return loc
-            except Exception:
-                pass
-
-        # Tier 2: exact text match
-        try:
-            loc = self._page.get_by_text(selector, exact=True).first
-            box = await loc.bounding_box(timeout=2000)
-            if box:
-                logger.info(f"Found element by exact text '{selector}'")
-                return loc
-        except Exception:
-            pass
-
-        # Tier 3: substring text match
-        try:
-            loc = self._page.get_by_text(selector, exact=False).first
-            box = await loc.bounding_box(timeout=2000)
-            if box:
-                logger.info(f"Found element by substring text '{selector}'")
-                return loc
-        except Exception:
-            pass
-
-        # Tier 4: CSS selector (for backward compatibility)
-        sanitized = sanitize_selector(selector)
-        try:
-            loc = self._page.locator(sanitized).first
-            box = await loc.bounding_box(timeout=2000)
-            if box:
-                logger.info(f"Found element by CSS selector '{sanitized}'")
-                return loc
-        except Exception:
-            pass
-
-        # Tier 5: text extracted from pseudo-selectors
-        text = _extract_text_from_selector(selector)
-        if text and text != selector:
-            try:
-                loc = self._page.get_by_text(text, exact=False).first
-                box = await loc.bounding_box(timeout=2000)
-                if box:
-                    logger.info(f"Found element by extracted text '{text}' from selector '{selector}'")
-                    return loc
-            except Exception:
-                pass
-
-        # Tier 6: aria-label matching
-        label = _extract_aria_label(selector)
-        if label:
-            try:
-                loc = self._page.get_by_label(label).first
-                box = await loc.bounding_box(timeout=2000)
-                if box:
-                    logger.info(f"Found element by aria-label '{label}'")
-                    return loc
-            except Exception:
-                pass
+    @property
+    def capture_mode(self) -> str:
+        return self._capture_mode
 
-        logger.warning(f"All fallbacks failed for selector: {selector}")
-        return None
+    @property
+    def capture_tier(self) -> dict:
+        """Current adaptive tier (fps, scale, quality) plus the load figures behind it."""
+        return self._controller.snapshot()
 
-    async def scan_interactive_elements(self) -> dict:
-        """Scan the current page for all visible interactive elements.
+    def frame_interval_stats(self) -> dict:
+        """Spacing between consecutive new frames, in ms (p50/p99 show pacing smoothness).
 
-        Returns a dict with categorized elements extracted from the live DOM.
-        Each element has: text, href (if link), role, and position info.
+        Only intervals inside a run of changing frames count — gaps where the page was static
+        are not jitter. dropped_ticks counts capture ticks skipped because the loop fell behind.
         """
-        if not self._page:
-            return {"nav_links": [], "buttons": [], "other_links": [], "inputs": []}
+        return {
+            **self._frame_intervals.summary(),
+            "dropped_ticks": self._scheduler.dropped_ticks,
+        }
 
-        async with self._page_lock:
-            raw = await self._page.evaluate("""
-                () => {
-                    // Helper: is element visible?
-                    function isVisible(el) {
-                        if (!el.offsetParent && el.tagName !== 'BODY') return false;
-                        const r = el.getBoundingClientRect();
-                        return r.width > 0 && r.height > 0;
-                    }
+    @property
+    def capture_idle(self) -> bool:
+        """True while the page is static and capture is polling at IDLE_FPS."""
+        return self._unchanged_frames >= IDLE_AFTER_UNCHANGED_FRAMES
 
-                    // Helper: is element inside a <nav> or has nav-like role?
-                    function isInNav(el) {
-                        let node = el;
-                        while (node) {
-                            if (node.tagName === 'NAV') return true;
-                            if (node.getAttribute && node.getAttribute('role') === 'navigation') return true;
-                            node = node.parentElement;
-                        }
-                        return false;
-                    }
+    def action_stats(self) -> dict[str, dict]:
+        """Per-action timing summary, keyed by action name.
 
-                    const results = {nav_links: [], buttons: [], other_links: [], inputs: []};
-
-                    // Collect all links
-                    for (const a of document.querySelectorAll('a[href]')) {
-                        if (!isVisible(a)) continue;
-                        const text = (a.innerText || a.getAttribute('aria-label') || '').trim();
-                        if (!text) continue;
-                        const entry = {
-                            text: text.substring(0, 80),
-                            href: a.href,
-                            path: new URL(a.href, location.origin).pathname,
-                            aria_label: a.getAttribute('aria-label') || null,
-                        };
-                        if (isInNav(a)) {
-                            results.nav_links.push(entry);
-                        } else {
-                            results.other_links.push(entry);
-                        }
-                    }
+        capture_blocked_ms is the longest gap between screenshot captures while the action held
+        the page, minus the expected poll interval (0 means capture kept up). It is only measured
+        in screenshot mode; screencast frames are pushed by Chrome and only arrive on repaint.
+        """
+        summary = {}
+        for name, st in self._action_stats.items():
+            count = st["count"]
+            summary[name] = {
+                "count": count,
+                "avg_lock_wait_ms": round(st["lock_wait_ms"] / count, 1),
+                "avg_hold_ms": round(st["hold_ms"] / count, 1),
+                "avg_capture_blocked_ms": round(st["capture_blocked_ms"] / count, 1),
+                "max_capture_blocked_ms": round(st["max_capture_blocked_ms"], 1),
+            }
+        return summary
 
-                    // Collect all buttons
-                    const btnSelectors = 'button, [role="button"], input[type="submit"], input[type="button"]';
-                    for (const btn of document.querySelectorAll(btnSelectors)) {
-                        if (!isVisible(btn)) continue;
-                        const text = (btn.innerText || btn.value || btn.getAttribute('aria-label') || '').trim();
-                        if (!text) continue;
-                        results.buttons.push({
-                            text: text.substring(0, 80),
-                            aria_label: btn.getAttribute('aria-label') || null,
-                        });
-                    }
+    def capture_metrics(self) -> dict:
+        """Rolling per-stage histograms (count/mean/p50/p99/max) for the video path.
 
-                    // Collect inputs (for context — not clickable but good to know about)
-                    for (const inp of document.querySelectorAll('input[type="text"], input[type="email"], input[type="search"], textarea')) {
-                        if (!isVisible(inp)) continue;
-                        const label = inp.getAttribute('aria-label') || inp.getAttribute('placeholder') || '';
-                        if (label) {
-                            results.inputs.push({text: label.substring(0, 80)});
-                        }
-                    }
+        lock_wait_ms is per tool action; screenshot_ms per CDP capture (screenshot and damage
+        modes); decode_ms per decoded frame; push_ms per capture_frame() call; fps and dropped
+        are one sample per METRICS_INTERVAL period. actions and locator_cache are cumulative
+        for the session (action_stats() and locator_cache_stats()).
+        """
+        return {
+            "room_id": self._room_id,
+            "mode": self._capture_mode,
+            "tier": self._controller.tier["name"],
+            "stages": self._metrics.summary(),
+            "frame_interval_ms": self._frame_intervals.summary(),
+            "counters": self.capture_counters(),
+            "resources": self._resource_usage,
+            "actions": self.action_stats(),
+            "locator_cache": self.locator_cache_stats(),
+        }
 
-                    return results;
-                }
-            """)
-        return raw
+    async def resource_usage(self) -> dict:
+        """This session's footprint in the browser: JS heap, DOM size and main-thread task time.
 
-    async def start(self, room: rtc.Room, url: str):
-        """Launch browser, navigate to URL, and start publishing screen share."""
-        logger.info(f"Starting browser screen share for {url}")
+        Measured per page through CDP Performance.getMetrics, so it stays per-session when
+        several sessions share one Chromium process.
+        """
+        session = self._capture_session
+        if session is None:
+            return {}
+        result = await session.send("Performance.getMetrics")
+        metrics = {m["name"]: m["value"] for m in result["metrics"]}
+        return {
+            "js_heap_used_mb": round(metrics.get("JSHeapUsedSize", 0) / 2**20, 1),
+            "js_heap_total_mb": round(metrics.get("JSHeapTotalSize", 0) / 2**20, 1),
+            "dom_nodes": int(metrics.get("Nodes", 0)),
+            "documents": int(metrics.get("Documents", 0)),
+            "frames": int(metrics.get("Frames", 0)),
+            "task_s": round(metrics.get("TaskDuration", 0), 2),
+        }
 
-        # Launch Playwright
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=True)
-        self._page = await self._browser.new_page(
-            viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT}
+    async def _sample_resource_usage(self):
+        try:
+            self._resource_usage = await self.resource_usage()
+        except Exception as e:
+            logger.debug(f"Resource metrics unavailable: {e}")
+            return
+        heap_mb = self._resource_usage.get("js_heap_used_mb", 0)
+        if heap_mb > CONTEXT_HEAP_WARN_MB:
+            log_event(json_logger, "context_over_budget", f"Page JS heap at {heap_mb} MB", {
+                "room_id": self._room_id,
+                "resources": self._resource_usage,
+                "limit_mb": CONTEXT_HEAP_WARN_MB,
+            }, level=logging.WARNING)
+
+    def _report_metrics(self, now: float):
+        """Close the current metrics period and write it to the presenter log."""
+        counters = self.capture_counters()
+        period = self._metrics.close_period(now, counters["frames_dropped"] + counters["ticks_dropped"])
+        self._last_metrics_report = now
+        log_event(json_logger, "capture_metrics", f"Capture {period['fps']} fps, {period['dropped']} dropped", {
+            "room_id": self._room_id,
+            "mode": self._capture_mode,
+            "tier": self._controller.tier["name"],
+            "period": period,
+            "stages": self._metrics.summary(),
+            "resources": self._resource_usage,
+            "actions": self.action_stats(),
+            "locator_cache": self.locator_cache_stats(),
+        }, level=logging.DEBUG)
+
+    def locator_cache_stats(self) -> dict:
+        """Hit/miss counts and hit rate of the element resolution cache."""
+        return self._locator_cache.stats()
+
+    def _on_dom_changed(self, source, payload: dict):
+        """Binding called by DOM_VERSION_JS after mutations or scrolls."""
+        self._locator_cache.note_dom_version(payload["version"])
+        self._element_index.set_scroll(payload["scrollX"], payload["scrollY"])
+
+    def _on_frame_navigated(self, frame):
+        if frame != self._page.main_frame:
+            return
+        self._last_url = frame.url
+        self._locator_cache.reset()
+        self._element_index.clear()
+        self._element_index_version = -1
+        # Same-document navigations keep the registry's docId; forget it so the next scan is a
+        # full resync that refills the cleared index
+        self._registry_doc = None
+        # Site-initiated navigations should bring capture back to full rate immediately
+        self._wake_capture()
+        origin = _url_origin(frame.url)
+        if self._page_origin is not None and origin != self._page_origin:
+            asyncio.ensure_future(self._place_cursor())
+        self._page_origin = origin
+
+    async def _place_cursor(self):
+        """Move the cursor to its stored position without animation (new origin, empty sessionStorage)."""
+        try:
+            await self._page.evaluate(
+                "([x, y]) => window.__placeCursor && window.__placeCursor(x, y)",
+                [self._cursor_x, self._cursor_y],
+            )
+        except Exception as e:
+            logger.warning(f"Could not place cursor: {e}")
+
+    @asynccontextmanager
+    async def _page_action(self, name: str):
+        """Hold _page_lock for a tool action and record how it affected capture."""
+        loop = asyncio.get_event_loop()
+        wait_start = loop.time()
+        async with self._page_lock:
+            start = loop.time()
+            self._action_active = True
+            self._action_last_capture = start
+            self._action_max_capture_gap = 0.0
+            try:
+                yield
+            finally:
+                end = loop.time()
+                self._action_active = False
+                self._record_action(name, start - wait_start, end - start, end)
+
+    def _record_action(self, name: str, lock_wait: float, hold: float, end: float):
+        blocked_ms = 0.0
+        if self._capture_mode == CAPTURE_MODE_SCREENSHOT and self._running:
+            # Include the gap still open at the end of the action
+            gap = max(self._action_max_capture_gap, end - self._action_last_capture)
+            expected = 1.0 / (IDLE_FPS if self.capture_idle else self._controller.tier["fps"])
+            blocked_ms = max(0.0, gap - expected) * 1000
+
+        st = self._action_stats.setdefault(name, {
+            "count": 0, "lock_wait_ms": 0.0, "hold_ms": 0.0,
+            "capture_blocked_ms": 0.0, "max_capture_blocked_ms": 0.0,
+        })
+        st["count"] += 1
+        self._metrics.record("lock_wait_ms", lock_wait * 1000)
+        self._metrics.note_action(name)
+        st["lock_wait_ms"] += lock_wait * 1000
+        st["hold_ms"] += hold * 1000
+        st["capture_blocked_ms"] += blocked_ms
+        st["max_capture_blocked_ms"] = max(st["max_capture_blocked_ms"], blocked_ms)
+
+        if blocked_ms > CAPTURE_BLOCKED_WARN_MS:
+            logger.warning(f"Capture blocked {blocked_ms:.0f}ms during {name} (held page {hold * 1000:.0f}ms)")
+
+    async def _run_page_actions(self, selector: str, steps: list[dict]) -> dict | None:
+        """Resolve selector and play steps on it in one round trip (see ACTION_RUNNER_JS).
+
+        The resolver applies the fallback priority (role → exact text → substring text → CSS →
+        text extracted from pseudo-selectors → aria-label) in-page; a LocatorCache hit passes the
+        element's ref so an unchanged page skips resolution. Returns the runner result, or None
+        if nothing matched. Caller must hold _page_lock.
+        """
+        if not self._page:
+            return None
+
+        text = _extract_text_from_selector(selector)
+        cached_ref = self._locator_cache.get(selector)
+        args = {
+            "resolve": {
+                "query": selector.strip(),
+                "css": sanitize_selector(selector),
+                "text": text if text and text != selector else None,
+                "label": _extract_aria_label(selector),
+            },
+            "ref": cached_ref,
+            "steps": steps,
+        }
+        # Resolution plus the longest smooth scroll and the awaited cursor move
+        awaited_ms = sum(st["duration"] for st in steps if st["action"] == "move")
+        timeout = RESOLVE_TIMEOUT + (MAX_SCROLL_MS + awaited_ms) / 1000
+        self._wake_capture()
+        try:
+            result = await asyncio.wait_for(self._page.evaluate(ACTION_RUNNER_JS, args), timeout)
+        except Exception as e:
+            logger.warning(f"Page actions failed for selector '{selector}': {e}")
+            return None
+
+        if not result:
+            logger.warning(f"All fallbacks failed for selector: {selector}")
+            return None
+        logger.info(
+            f"Found element by {result['strategy']} for '{selector}'"
+            + (f" (first visible of {result['matches']})" if result["matches"] > 1 else "")
         )
+        if result["domVersion"] is not None:
+            self._locator_cache.put(selector, result["ref"], result["domVersion"])
+        if any(st["action"] == "move" for st in steps):
+            # Save cursor destination so it can be restored after cross-origin navigations
+            box = result["box"]
+            self._cursor_x = box["x"] + box["width"] / 2
+            self._cursor_y = box["y"] + box["height"] / 2
+        return result
 
-        # Re-inject cursor automatically after any full page load (covers site-initiated navigations)
-        self._page.on("load", lambda _: asyncio.ensure_future(self._inject_cursor()))
+    async def scan_interactive_elements(self) -> dict:
+        """Return all visible interactive elements on the current page.
 
-        await self._page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        await self._inject_cursor()
-        logger.info(f"Browser navigated to {url}")
+        Returns a dict with categorized elements (nav_links, buttons, other_links, inputs).
+        Each element has: text, href (if link), path (if link), aria_label, box (viewport
+        x/y/width/height) and in_viewport.
 
-        # Create video source and publish as screen share track
+        Backed by the in-page registry: only entries and boxes that changed since the previous
+        scan cross the wire, and they also refresh the element spatial index.
+        """
+        empty = {"nav_links": [], "buttons": [], "other_links": [], "inputs": []}
+        if not self._page:
+            return empty
+
+        async with self._page_action("scan_interactive_elements"):
+            delta = await self._page.evaluate(
+                "([docId, since]) => window.__demoRegistry ? window.__demoRegistry.query(docId, since) : null",
+                [self._registry_doc, self._registry_version],
+            )
+        if delta is None:
+            return empty
+
+        index = self._element_index
+        if delta["reset"]:
+            self._registry_entries = {}
+            index.clear()
+        for entry in delta["upserts"]:
+            self._registry_entries[entry["id"]] = entry
+        for entry_id in delta["removed"]:
+            self._registry_entries.pop(entry_id, None)
+            index.remove(entry_id)
+        self._registry_doc = delta["docId"]
+        self._registry_version = delta["version"]
+
+        changed = delta["reset"] or delta["upserts"] or delta["removed"] or delta["visible"] is not None
+        if delta["visible"] is not None:
+            self._registry_visible = delta["visible"]
+            index.retain(set(delta["visible"]))
+        for entry_id, x, y, width, height, pinned in delta["boxes"]:
+            index.update(entry_id, x, y, width, height, pinned)
+        index.set_scroll(delta["scrollX"], delta["scrollY"])
+        if delta["domVersion"] is not None:
+            self._element_index_version = delta["domVersion"]
+
+        scroll = (index.scroll_x, index.scroll_y)
+        if self._scan_snapshot is not None and not changed and not delta["boxes"] and scroll == self._scan_snapshot_scroll:
+            return self._scan_snapshot
+
+        on_screen = set(index.in_viewport())
+        results = {"nav_links": [], "buttons": [], "other_links": [], "inputs": []}
+        for entry_id in self._registry_visible:
+            entry = self._registry_entries.get(entry_id)
+            if entry is None:
+                continue
+            geometry = {"box": index.box(entry_id), "in_viewport": entry_id in on_screen}
+            if entry["link"]:
+                link = {**entry["link"], **geometry}
+                nav = link.pop("nav")
+                results["nav_links" if nav else "other_links"].append(link)
+            if entry["button"]:
+                results["buttons"].append({**entry["button"], **geometry})
+            if entry["input"]:
+                results["inputs"].append({**entry["input"], **geometry})
+        self._scan_snapshot = results
+        self._scan_snapshot_scroll = scroll
+        return results
+
+    async def visible_elements(self) -> list[dict]:
+        """Interactive elements on screen right now, top to bottom, with viewport boxes.
+
+        Answered from the spatial index without a page round trip; the index is only refreshed
+        (one registry query) when the DOM changed since it was built. Scrolling alone never
+        needs a refresh since scroll offsets are pushed by the page.
+        """
+        if self._element_index_version < 0 or self._element_index_version != self._locator_cache.dom_version:
+            await self.scan_interactive_elements()
+        index = self._element_index
+        elements = []
+        for entry_id in index.in_viewport():
+            entry = self._registry_entries.get(entry_id)
+            if entry is None:
+                continue
+            for kind in ("link", "button", "input"):
+                if entry[kind]:
+                    elements.append({"kind": kind, "text": entry[kind]["text"], "box": index.box(entry_id)})
+                    break
+        elements.sort(key=lambda e: (e["box"]["y"], e["box"]["x"]))
+        return elements
+
+    async def start(self, room: rtc.Room, url: str):
+        """Publish the screen share track, launch the browser and navigate, then start capture.
+
+        The track is published right away with a placeholder frame while the browser opens the
+        page in parallel, so the share appears for the viewer before navigation finishes.
+        """
+        logger.info(f"Starting browser screen share for {url}")
+        self._room_id = room.name
+        self._startup_start = time.monotonic()
         self._source = rtc.VideoSource(VIEWPORT_WIDTH, VIEWPORT_HEIGHT)
+        placeholder = asyncio.create_task(self._placeholder_loop())
+        try:
+            await asyncio.gather(self._publish_track(room), self.open(url))
+        finally:
+            placeholder.cancel()
+        await self.start_capture(self._source)
+        try:
+            await asyncio.wait_for(self._first_frame.wait(), FIRST_FRAME_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"No page frame within {FIRST_FRAME_TIMEOUT}s of capture start")
+
+    async def _publish_track(self, room: rtc.Room):
         track = rtc.LocalVideoTrack.create_video_track("browser-screen", self._source)
         options = rtc.TrackPublishOptions(
             source=rtc.TrackSource.SOURCE_SCREENSHARE,
         )
         await room.local_participant.publish_track(track, options)
+        self._mark_startup("track_published")
         logger.info("Screen share track published")
 
-        # Start capture loop
-        self._running = True
-        self._capture_task = asyncio.create_task(self._capture_loop())
-
-    @staticmethod
-    def _decode_frame(screenshot_bytes: bytes) -> rtc.VideoFrame:
-        """CPU-bound: decode JPEG and convert to RGBA VideoFrame. Runs in thread pool."""
-        img = Image.open(io.BytesIO(screenshot_bytes)).convert("RGBA")
-        if img.size != (VIEWPORT_WIDTH, VIEWPORT_HEIGHT):
-            img = img.resize((VIEWPORT_WIDTH, VIEWPORT_HEIGHT))
-        frame_data = np.array(img)
-        return rtc.VideoFrame(
+    async def _placeholder_loop(self):
+        """Keep a placeholder frame on the track until capture takes over."""
+        frame = rtc.VideoFrame(
             width=VIEWPORT_WIDTH,
             height=VIEWPORT_HEIGHT,
             type=rtc.VideoBufferType.RGBA,
-            data=frame_data.tobytes(),
+            data=bytearray(bytes(PLACEHOLDER_RGBA) * (VIEWPORT_WIDTH * VIEWPORT_HEIGHT)),
+        )
+        loop = asyncio.get_event_loop()
+        while True:
+            self._push_frame(frame, _monotonic_us(loop.time()), keepalive=True)
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+
+    def _mark_startup(self, name: str):
+        if self._startup_start is not None and name not in self._startup_marks:
+            self._startup_marks[name] = round((time.monotonic() - self._startup_start) * 1000, 1)
+
+    def startup_timeline(self) -> dict[str, float]:
+        """Milliseconds from start() to each startup step (track_published, browser_ready,
+        navigated, capture_started, first_frame)."""
+        return dict(self._startup_marks)
+
+    async def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait until the page is open (start() publishes before it is). False on timeout."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _acquire_browser(self) -> Browser:
+        """Attach to a prewarmed browser from the pool, or launch one."""
+        start = time.monotonic()
+        leased = None
+        if self._browser_pool:
+            try:
+                leased = await asyncio.to_thread(self._browser_pool.lease)
+            except Exception as e:
+                logger.warning(f"Browser pool lease failed, launching instead: {e}")
+        browser = None
+        if leased:
+            try:
+                browser = await self._playwright.chromium.connect_over_cdp(leased.endpoint)
+                self._pooled_browser = leased
+            except Exception as e:
+                logger.warning(f"Could not attach to prewarmed browser, launching instead: {e}")
+                await asyncio.to_thread(self._browser_pool.release, leased)
+        if browser is None:
+            browser = await self._playwright.chromium.launch(headless=True)
+        browser.on("disconnected", self._on_browser_disconnected)
+        log_event(json_logger, "browser_ready", "Browser ready", {
+            "room_id": self._room_id,
+            "pooled": self._pooled_browser is not None,
+            "ms": round((time.monotonic() - start) * 1000, 1),
+            "pool": self._browser_pool.stats() if self._browser_pool else None,
+        })
+        return browser
+
+    async def open(self, url: str):
+        """Launch the browser and navigate to URL (no capture yet)."""
+        self._playwright = await async_playwright().start()
+        self._browser = await self._acquire_browser()
+        self._mark_startup("browser_ready")
+        await self._new_context()
+        await self._new_page()
+        self._last_url = url
+        await self._page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        self._mark_startup("navigated")
+        self._ready.set()
+        logger.info(f"Browser navigated to {url}")
+
+    async def _new_context(self):
+        self._context = await self._browser.new_context(
+            viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT}
         )
+        # In-page helpers run in every document before its own scripts (no per-action injection)
+        await self._context.expose_binding("__demoDomChanged", self._on_dom_changed)
+        for script in (CURSOR_INIT_JS, DOM_VERSION_JS, INTERACTIVE_REGISTRY_JS):
+            await self._context.add_init_script(script)
+        if self._capture_mode == CAPTURE_MODE_DAMAGE:
+            await self._context.add_init_script(DAMAGE_TRACKER_JS)
+
+    async def _new_page(self):
+        self._page = await self._context.new_page()
+        self._settle = PageSettle(self._page)
+        # A new document invalidates every cached element
+        self._page.on("framenavigated", self._on_frame_navigated)
+        self._page.on("crash", self._on_page_crash)
+
+    async def _open_capture_session(self):
+        """Dedicated CDP session for capture (and per-page resource metrics)."""
+        self._capture_session = await self._page.context.new_cdp_session(self._page)
+        await self._capture_session.send("Performance.enable")
+        if self._capture_mode == CAPTURE_MODE_SCREENCAST:
+            await self._start_screencast()
+
+    def _on_page_crash(self, page):
+        self._schedule_recovery("page_crash")
+
+    def _on_browser_disconnected(self, browser):
+        self._schedule_recovery("browser_disconnected")
+
+    def _schedule_recovery(self, reason: str):
+        if self._stopping or self._recovery:
+            return
+        log_event(json_logger, "browser_crashed", f"Browser {reason}, recovering", {
+            "room_id": self._room_id,
+            "reason": reason,
+            "url": self._last_url,
+        }, level=logging.WARNING)
+        self._recovery = asyncio.ensure_future(self._recover(reason))
+
+    async def _recover(self, reason: str):
+        """Rebuild the page, and the browser connection if it was lost, then reload the last URL.
+
+        Runs under the page lock so queued tool actions wait for it; the viewer keeps seeing
+        the last good frame meanwhile.
+        """
+        start = time.monotonic()
+        try:
+            async with self._page_lock:
+                await self._close_capture_session()
+                if reason == "browser_disconnected":
+                    if self._pooled_browser:
+                        await asyncio.to_thread(self._browser_pool.release, self._pooled_browser)
+                        self._pooled_browser = None
+                    self._browser = await self._acquire_browser()
+                    await self._new_context()
+                else:
+                    try:
+                        await self._page.close()
+                    except Exception:
+                        pass
+                await self._new_page()
+                await self._page.goto(self._last_url, wait_until="domcontentloaded", timeout=30000)
+                if self._running:
+                    await self._open_capture_session()
+            self._wake_capture()
+            log_event(json_logger, "browser_recovered", f"Recovered from {reason}", {
+                "room_id": self._room_id,
+                "reason": reason,
+                "url": self._last_url,
+                "ms": round((time.monotonic() - start) * 1000, 1),
+            })
+        except Exception as e:
+            log_event(json_logger, "browser_recovery_failed", f"Could not recover from {reason}: {e}", {
+                "room_id": self._room_id,
+                "reason": reason,
+                "error": str(e),
+            }, level=logging.ERROR)
+        finally:
+            self._recovery = None
+
+    async def start_capture(self, source: rtc.VideoSource):
+        """Start feeding frames into source. Anything with capture_frame() works (benchmarks use a stub)."""
+        self._source = source
+        self._decoder = FrameDecoder(*self._frame_size())
+        self._running = True
+        self._last_metrics_report = asyncio.get_event_loop().time()
+        self._metrics.start(self._last_metrics_report)
+        # Capture on a dedicated CDP session so it never contends with tool actions
+        await self._open_capture_session()
+        if self._capture_mode == CAPTURE_MODE_DAMAGE:
+            self._capture_task = asyncio.create_task(self._damage_capture_loop())
+        elif self._capture_mode == CAPTURE_MODE_SCREENSHOT:
+            self._capture_task = asyncio.create_task(self._capture_loop())
+        self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+        self._mark_startup("capture_started")
+        logger.info(f"Capture started (mode={self._capture_mode})")
+
+    def capture_counters(self) -> dict:
+        """Cumulative frame counters for the capture pipeline."""
+        return {
+            "frames_decoded": self._decoder.decoded if self._decoder else 0,
+            "frames_dropped": self._decoder.dropped if self._decoder else 0,
+            "frames_suppressed": self._frames_suppressed,
+            "ticks_dropped": self._scheduler.dropped_ticks,
+        }
+
+    def _frame_size(self) -> tuple[int, int]:
+        """Published frame size for the current tier (kept even for I420 conversion)."""
+        scale = self._controller.tier["scale"]
+        return int(VIEWPORT_WIDTH * scale) // 2 * 2, int(VIEWPORT_HEIGHT * scale) // 2 * 2
+
+    async def _apply_capture_tier(self):
+        """Push the controller's current tier into the decoder and (for screencast) Chrome."""
+        self._decoder.resize(*self._frame_size())
+        if self._capture_mode == CAPTURE_MODE_SCREENCAST and self._capture_session:
+            try:
+                await self._capture_session.send("Page.stopScreencast")
+                await self._capture_session.send("Page.startScreencast", self._screencast_params())
+            except Exception as e:
+                logger.warning(f"Could not restart screencast for new tier: {e}")
+        self._wake_capture()
+
+    def _wake_capture(self):
+        """Leave idle mode and capture at full rate (cursor moves, scrolls, navigation)."""
+        self._unchanged_frames = 0
+        self._wake_event.set()
+
+    def _submit_frame(self, jpeg_bytes: bytes, timestamp_us: int):
+        """Hand a captured JPEG (and its capture timestamp) to the decode stage.
+
+        Captures byte-identical to the previous one are skipped entirely (the keepalive loop
+        re-sends the cached frame). When the decoder is full the frame waits in a single
+        latest-wins slot, so the final frame of an animation is never lost but stale
+        intermediate frames are dropped.
+        """
+        digest = hashlib.blake2b(jpeg_bytes, digest_size=16).digest()
+        if digest == self._last_frame_digest:
+            self._note_unchanged()
+            return
+        self._last_frame_digest = digest
+        self._unchanged_frames = 0
+
+        if self._decoder.busy:
+            if self._pending_jpeg is not None:
+                self._decoder.note_dropped()
+            self._pending_jpeg = (jpeg_bytes, timestamp_us)
+            return
+        task = asyncio.ensure_future(self._decode_and_push(jpeg_bytes, timestamp_us))
+        self._decode_tasks.add(task)
+        task.add_done_callback(self._decode_tasks.discard)
+
+    async def _decode_and_push(self, jpeg_bytes: bytes, timestamp_us: int):
+        loop = asyncio.get_event_loop()
+        try:
+            decode_start = loop.time()
+            frame = await self._decoder.decode(jpeg_bytes)
+            if frame is not None:
+                decode_time = loop.time() - decode_start
+                self._controller.record_decode(decode_time)
+                self._metrics.record("decode_ms", decode_time * 1000)
+            if frame is not None and self._running:
+                self._push_frame(frame, timestamp_us)
+        except Exception as e:
+            logger.error(f"Frame decode error: {e}")
+
+        if self._running and self._pending_jpeg is not None and not self._decoder.busy:
+            pending = self._pending_jpeg
+            self._pending_jpeg = None
+            self._submit_frame(*pending)
+
+    def _note_unchanged(self):
+        """A capture found nothing new — counts toward idle mode and ends the content streak."""
+        self._unchanged_frames += 1
+        self._frames_suppressed += 1
+        self._content_streak = False
+
+    def _push_frame(self, frame: rtc.VideoFrame, timestamp_us: int, keepalive: bool = False):
+        """Send a frame to the video source with an explicit capture timestamp.
+
+        Timestamps are forced strictly increasing (a keepalive can go out between a capture and
+        its decode). New-content frames also feed the frame-interval window.
+        """
+        timestamp_us = max(timestamp_us, self._last_timestamp_us + 1)
+        push_start = time.perf_counter()
+        self._source.capture_frame(frame, timestamp_us=timestamp_us)
+        self._metrics.record("push_ms", (time.perf_counter() - push_start) * 1000)
+        self._last_timestamp_us = timestamp_us
+        self._last_good_frame = frame
+        self._last_push_time = asyncio.get_event_loop().time()
+        if keepalive:
+            return
+        if not self._first_frame.is_set():
+            self._first_frame.set()
+            self._mark_startup("first_frame")
+        self._metrics.note_frame()
+        interval_ms = (timestamp_us - self._last_content_timestamp_us) / 1000
+        if self._content_streak and interval_ms <= KEEPALIVE_INTERVAL * 1000:
+            self._frame_intervals.add(interval_ms)
+        self._last_content_timestamp_us = timestamp_us
+        self._content_streak = True
+
+    def _repush_last_frame(self):
+        """Re-send the cached frame (keepalive / capture error fallback)."""
+        if self._last_good_frame is not None:
+            self._push_frame(self._last_good_frame, _monotonic_us(asyncio.get_event_loop().time()), keepalive=True)
+
+    def _tick_timestamp_us(self) -> int:
+        """Timestamp for a frame captured on the current scheduler tick."""
+        deadline = self._scheduler.deadline
+        return _monotonic_us(deadline if deadline is not None else asyncio.get_event_loop().time())
+
+    def _note_capture(self, now: float):
+        """Track capture gaps while a tool action holds the page (feeds capture_blocked_ms)."""
+        if self._action_active:
+            self._action_max_capture_gap = max(self._action_max_capture_gap, now - self._action_last_capture)
+            self._action_last_capture = now
 
     async def _capture_loop(self):
-        """Continuously capture browser screenshots and push to video source."""
-        interval = 1.0 / TARGET_FPS
+        """Continuously capture browser screenshots and push to video source.
+
+        Polls at the tier FPS while the page changes and drops to IDLE_FPS once it has been
+        static for IDLE_AFTER_UNCHANGED_FRAMES captures; _wake_capture() cuts the idle wait short.
+        """
         loop = asyncio.get_event_loop()
+        self._scheduler.reset(loop.time())
         while self._running:
             frame_start = loop.time()
+            timestamp_us = self._tick_timestamp_us()
+            tier = self._controller.tier
             try:
-                async with self._page_lock:
-                    screenshot_bytes = await self._page.screenshot(type="jpeg", quality=65)
-                frame = await loop.run_in_executor(
-                    None, self._decode_frame, screenshot_bytes
-                )
-                self._source.capture_frame(frame)
-                self._last_good_frame = frame
+                jpeg_bytes = await self._capture_jpeg(tier)
+                self._controller.record_capture(loop.time() - frame_start)
+                self._note_capture(loop.time())
+                self._submit_frame(jpeg_bytes, timestamp_us)
             except Exception as e:
                 logger.error(f"Screen capture error: {e}")
-                if self._last_good_frame is not None:
-                    self._source.capture_frame(self._last_good_frame)
+                self._repush_last_frame()
 
-            elapsed = loop.time() - frame_start
-            await asyncio.sleep(max(0.0, interval - elapsed))
+            await self._wait_next_frame(tier)
 
-    async def _inject_cursor(self):
-        """Inject the custom cursor overlay into the current page at the stored position."""
-        if self._page:
+    async def _wait_next_frame(self, tier: dict):
+        """Sleep until the next scheduler tick (tier FPS, or IDLE_FPS when static).
+
+        _wake_capture() cuts the wait short and restarts the tick grid from that moment.
+        """
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        interval = 1.0 / (IDLE_FPS if self.capture_idle else tier["fps"])
+        if interval != self._frame_interval:
+            self._frame_interval = interval
+            self._scheduler.reset(now)
+        delay = self._scheduler.advance(now, interval)
+        if not self._wake_event.is_set():
             try:
-                await self._page.evaluate(CURSOR_INJECT_JS, [self._cursor_x, self._cursor_y])
+                await asyncio.wait_for(self._wake_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                return
+        self._wake_event.clear()
+        self._scheduler.reset(loop.time())
+
+    async def _capture_jpeg(self, tier: dict, clip: dict | None = None) -> bytes:
+        """Capture one JPEG over the capture session.
+
+        clip is a viewport-relative rect in CSS pixels (with scroll offsets already added when
+        it came from the damage tracker). Without a clip the whole viewport is captured; at
+        scale < 1 that needs an explicit clip too, offset by the current scroll position since
+        CDP clips are in document coordinates.
+        """
+        params = {
+            "format": "jpeg",
+            "quality": tier["quality"],
+            "optimizeForSpeed": True,
+        }
+        if clip is None and tier["scale"] < 1.0:
+            metrics = await self._capture_session.send("Page.getLayoutMetrics")
+            vp = metrics["cssVisualViewport"]
+            clip = {"x": vp["pageX"], "y": vp["pageY"], "width": vp["clientWidth"], "height": vp["clientHeight"]}
+        if clip is not None:
+            params["clip"] = {**clip, "scale": tier["scale"]}
+        capture_start = time.perf_counter()
+        result = await self._capture_session.send("Page.captureScreenshot", params)
+        self._metrics.record("screenshot_ms", (time.perf_counter() - capture_start) * 1000)
+        return base64.b64decode(result["data"])
+
+    async def _drain_damage(self) -> dict | None:
+        """Fetch and reset the page's damage record (None if the tracker is not installed)."""
+        result = await self._capture_session.send("Runtime.evaluate", {
+            "expression": "window.__demoDamage ? window.__demoDamage.drain() : null",
+            "returnByValue": True,
+        })
+        return result.get("result", {}).get("value")
+
+    async def _damage_capture_loop(self):
+        """Capture only changed regions and composite them into a persistent frame.
+
+        Each tick drains the in-page damage tracker. No damage means nothing is captured (the
+        keepalive re-sends the frame and the loop drops to IDLE_FPS like screenshot mode).
+        Scrolls, navigations, large or fragmented damage and the periodic refresh fall back to
+        a full-viewport capture.
+        """
+        loop = asyncio.get_event_loop()
+        compositor = FrameCompositor(self._decoder)
+        last_full = 0.0
+        self._scheduler.reset(loop.time())
+        while self._running:
+            frame_start = loop.time()
+            timestamp_us = self._tick_timestamp_us()
+            tier = self._controller.tier
+            try:
+                damage = await self._drain_damage()
+                rects = []
+                full = (
+                    damage is None
+                    or damage["full"]
+                    or compositor.needs_full_frame
+                    or frame_start - last_full >= FULL_REFRESH_INTERVAL
+                )
+                if not full:
+                    rects = _merge_damage_rects(damage["rects"], VIEWPORT_WIDTH, VIEWPORT_HEIGHT)
+                    area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+                    if len(rects) > MAX_DAMAGE_RECTS or area > DAMAGE_FULL_FRACTION * VIEWPORT_WIDTH * VIEWPORT_HEIGHT:
+                        full = True
+
+                if full or rects:
+                    scale = tier["scale"]
+                    self._compositing = True
+                    try:
+                        if full:
+                            last_full = frame_start
+                            frame_w, frame_h = self._frame_size()
+                            jpeg_bytes = await self._capture_jpeg(tier)
+                            self._note_capture(loop.time())
+                            decode_start = loop.time()
+                            await compositor.paste(jpeg_bytes, 0, 0, frame_w, frame_h)
+                        else:
+                            decode_start = None
+                            for x0, y0, x1, y1 in rects:
+                                jpeg_bytes = await self._capture_jpeg(tier, {
+                                    "x": x0 + damage["scrollX"],
+                                    "y": y0 + damage["scrollY"],
+                                    "width": x1 - x0,
+                                    "height": y1 - y0,
+                                })
+                                if decode_start is None:
+                                    decode_start = loop.time()
+                                await compositor.paste(
+                                    jpeg_bytes,
+                                    round(x0 * scale), round(y0 * scale),
+                                    round((x1 - x0) * scale), round((y1 - y0) * scale),
+                                )
+                            self._note_capture(loop.time())
+                        decode_time = loop.time() - decode_start
+                        self._controller.record_decode(decode_time)
+                        self._metrics.record("decode_ms", decode_time * 1000)
+                    finally:
+                        self._compositing = False
+                    self._controller.record_capture(loop.time() - frame_start)
+                    self._unchanged_frames = 0
+                    if self._running:
+                        self._push_frame(compositor.frame, timestamp_us)
+                else:
+                    self._note_capture(loop.time())
+                    self._note_unchanged()
             except Exception as e:
-                logger.warning(f"Could not inject cursor: {e}")
+                logger.error(f"Damage capture error: {e}")
+                self._repush_last_frame()
+
+            await self._wait_next_frame(tier)
 
-    async def _start_cursor_animation(self, locator_or_selector, duration_ms: int = 500):
-        """Start cursor animation toward an element. Caller must hold _page_lock.
+    async def _start_screencast(self):
+        """Ask Chrome to push JPEG frames over the capture session as the page repaints."""
+        self._wall_clock_offset = time.time() - asyncio.get_event_loop().time()
+        self._capture_session.on(
+            "Page.screencastFrame",
+            lambda params: asyncio.ensure_future(self._on_screencast_frame(params)),
+        )
+        await self._capture_session.send("Page.startScreencast", self._screencast_params())
+
+    def _screencast_params(self) -> dict:
+        tier = self._controller.tier
+        width, height = self._frame_size()
+        return {
+            "format": "jpeg",
+            "quality": tier["quality"],
+            "maxWidth": width,
+            "maxHeight": height,
+            "everyNthFrame": max(1, round(COMPOSITOR_FPS / tier["fps"])),
+        }
 
-        Accepts either a Locator (already resolved) or a string selector (will use fallback).
-        Returns (duration_to_wait, resolved_locator) or (0, None) if animation couldn't start.
+    async def _on_screencast_frame(self, params: dict):
+        """Ack a pushed screencast frame, then hand it to the decode stage.
+
+        Chrome will not send the next frame until the current one is acked, so ack first and
+        decode afterwards.
         """
-        if not self._page:
-            return 0, None
+        session = self._capture_session
+        if session is None or not self._running:
+            return
+        try:
+            await session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+        except Exception as e:
+            logger.warning(f"Screencast ack failed: {e}")
 
+        # Prefer Chrome's own composite time over arrival time (arrival jitters with loop load)
+        loop_time = asyncio.get_event_loop().time()
+        wall_timestamp = params.get("metadata", {}).get("timestamp")
+        if wall_timestamp:
+            loop_time = min(loop_time, wall_timestamp - self._wall_clock_offset)
+        self._submit_frame(base64.b64decode(params["data"]), _monotonic_us(loop_time))
+
+    async def _keepalive_loop(self):
+        """Re-send the last frame while nothing new is being pushed (static page).
+
+        Also drives the adaptive controller and the periodic metrics report, since this loop
+        runs in every capture mode.
+        """
+        loop = asyncio.get_event_loop()
+        while self._running:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            if self._controller.evaluate(loop.time()):
+                await self._apply_capture_tier()
+            if loop.time() - self._last_metrics_report >= METRICS_INTERVAL:
+                await self._sample_resource_usage()
+                self._report_metrics(loop.time())
+            idle = loop.time() - self._last_push_time
+            # Skip while damage regions are being written into the composite frame (would tear)
+            if idle >= KEEPALIVE_INTERVAL and not self._compositing:
+                try:
+                    self._repush_last_frame()
+                except Exception as e:
+                    logger.error(f"Keepalive frame error: {e}")
+
+    async def _close_capture_session(self):
+        session = self._capture_session
+        self._capture_session = None
+        if session is None:
+            return
         try:
-            if isinstance(locator_or_selector, str):
-                locator = await self._find_element_with_fallback(locator_or_selector)
-            else:
-                locator = locator_or_selector
-
-            if not locator:
-                return 0, None
-
-            box = await locator.bounding_box(timeout=3000)
-            if box:
-                target_x = box["x"] + box["width"] / 2
-                target_y = box["y"] + box["height"] / 2
-                # Save cursor destination so it persists across page navigations
-                self._cursor_x = target_x
-                self._cursor_y = target_y
-                await self._page.evaluate(
-                    f"void(window.__moveCursorTo && window.__moveCursorTo({target_x}, {target_y}, {duration_ms}))"
-                )
-                return duration_ms, locator
+            if self._capture_mode == CAPTURE_MODE_SCREENCAST:
+                await session.send("Page.stopScreencast")
+            await session.detach()
         except Exception as e:
-            logger.warning(f"Could not start cursor animation to {locator_or_selector}: {e}")
-        return 0, None
+            logger.warning(f"Capture session close error (non-fatal): {e}")
+
+    async def wait_until_settled(self, ceiling: float = CLICK_SETTLE_CEILING) -> dict:
+        """Wait for network, DOM and layout to go quiet (see backend.page_settle)."""
+        if not self._settle:
+            return {"settled": False, "waited_ms": 0.0}
+        result = await self._settle.wait(ceiling)
+        if not result["settled"]:
+            logger.info(f"Page still busy after {result['waited_ms']}ms, continuing")
+        return result
 
     async def navigate(self, url: str):
         """Navigate browser to a new URL."""
         if self._page:
-            async with self._page_lock:
+            self._wake_capture()
+            async with self._page_action("navigate"):
                 await self._page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                await self._inject_cursor()
             logger.info(f"Navigated to {url}")
 
     async def click(self, selector: str):
-        """Move cursor to element smoothly, then click it using fallback resolution."""
+        """Move cursor to element smoothly, then click it.
+
+        Resolution, scrolling it into view and the cursor move run in one in-page step; the click
+        itself is a trusted mouse event at the element's center, or a locator click when another
+        element covers that point.
+        """
         if self._page:
-            # Phase 1: resolve element and start cursor animation (brief lock)
-            async with self._page_lock:
-                await self._inject_cursor()
-                duration, locator = await self._start_cursor_animation(selector, duration_ms=700)
+            async with self._page_action("click:move"):
+                result = await self._run_page_actions(selector, [
+                    {"action": "scroll", "mode": "reveal"},
+                    {"action": "move", "duration": CLICK_MOVE_MS},
+                ])
 
-            if locator is None:
+            if result is None:
                 raise Exception(
                     f"Could not find element '{selector}' after trying CSS, text, "
                     "and aria-label matching. Try a simpler selector or skip to the next step."
                 )
 
-            # Phase 2: wait for animation WITHOUT holding the lock
-            if duration > 0:
-                await asyncio.sleep(duration / 1000 + 0.05)
-
-            # Phase 3: perform the actual click via the resolved locator (brief lock)
-            async with self._page_lock:
-                await locator.click(timeout=5000)
+            async with self._page_action("click:press"):
+                if result["hit"]:
+                    box = result["box"]
+                    await self._page.mouse.click(box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
+                else:
+                    await self._page.locator(f'[{ELEMENT_REF_ATTR}="{result["ref"]}"]').click(timeout=5000)
             logger.info(f"Clicked {selector}")
 
     async def scroll_down(self, pixels: int = 400):
         """Scroll down the page with a smooth animation."""
         if self._page:
+            self._wake_capture()
             duration_ms = max(400, min(1200, pixels * 2))  # scale with distance, 400-1200ms
 
             # Phase 1: start smooth scroll animation (fire-and-forget), then release lock
-            async with self._page_lock:
-                await self._inject_cursor()
+            async with self._page_action("scroll_down"):
                 await self._page.evaluate(
                     f"void(window.__smoothScrollBy && window.__smoothScrollBy({pixels}, {duration_ms}))"
                 )
@@ -493,84 +1863,37 @@ class BrowserScreenShare:
             await asyncio.sleep(duration_ms / 1000 + 0.05)
 
     async def scroll_to_element(self, selector: str):
-        """Scroll to bring an element into view smoothly, then move cursor to it."""
+        """Scroll to bring an element into view smoothly, then move cursor to it (one round trip)."""
         if self._page:
-            # Phase 1: resolve element, calculate scroll distance, start smooth scroll
-            scroll_duration_ms = 0
-            locator = None
-            async with self._page_lock:
-                await self._inject_cursor()
-                locator = await self._find_element_with_fallback(selector)
-                if locator:
-                    try:
-                        box = await locator.bounding_box(timeout=3000)
-                        if box:
-                            target_center_y = box["y"] + box["height"] / 2
-                            viewport_center = VIEWPORT_HEIGHT / 2
-                            delta = target_center_y - viewport_center
-                            if abs(delta) > 50:
-                                scroll_duration_ms = max(400, min(1200, int(abs(delta) * 2)))
-                                await self._page.evaluate(
-                                    f"void(window.__smoothScrollBy && window.__smoothScrollBy({delta}, {scroll_duration_ms}))"
-                                )
-                    except Exception as e:
-                        logger.warning(f"Could not calculate scroll for {selector}: {e}")
-                        try:
-                            await locator.scroll_into_view_if_needed(timeout=5000)
-                        except Exception:
-                            pass
-
-            if locator is None:
+            async with self._page_action("scroll_to_element"):
+                result = await self._run_page_actions(selector, [
+                    {"action": "scroll", "mode": "center"},
+                    {"action": "move", "duration": POINT_MOVE_MS},
+                ])
+
+            if result is None:
                 raise Exception(
                     f"Could not find element '{selector}' after trying CSS, text, "
                     "and aria-label matching. Try a simpler selector or skip to the next step."
                 )
 
-            # Phase 2: wait for scroll animation
-            if scroll_duration_ms > 0:
-                await asyncio.sleep(scroll_duration_ms / 1000 + 0.05)
-
-            # Phase 3: animate cursor to the already-resolved element
-            async with self._page_lock:
-                await self._inject_cursor()
-                cursor_duration, _ = await self._start_cursor_animation(locator, duration_ms=600)
-
-            if cursor_duration > 0:
-                await asyncio.sleep(cursor_duration / 1000 + 0.05)
-
     async def highlight_element(self, selector: str):
-        """Move cursor to element, then add a visual highlight around it."""
+        """Move cursor to element, then add a visual highlight around it (one round trip)."""
         if self._page:
-            # Phase 1: resolve element and start cursor animation
-            async with self._page_lock:
-                await self._inject_cursor()
-                duration, locator = await self._start_cursor_animation(selector, duration_ms=600)
-
-            if locator is None:
+            async with self._page_action("highlight_element"):
+                result = await self._run_page_actions(selector, [
+                    {"action": "scroll", "mode": "reveal"},
+                    {"action": "move", "duration": POINT_MOVE_MS},
+                    {"action": "highlight", "duration": HIGHLIGHT_MS},
+                ])
+
+            if result is None:
                 logger.warning(f"Could not highlight element: {selector}")
-                return
-
-            # Phase 2: wait for animation WITHOUT holding lock
-            if duration > 0:
-                await asyncio.sleep(duration / 1000 + 0.05)
-
-            # Phase 3: apply the highlight via the resolved locator (bypasses querySelector)
-            async with self._page_lock:
-                await locator.evaluate("""
-                    (el) => {
-                        el.style.outline = '3px solid #FF6B00';
-                        el.style.outlineOffset = '2px';
-                        setTimeout(() => {
-                            el.style.outline = '';
-                            el.style.outlineOffset = '';
-                        }, 3000);
-                    }
-                """)
 
     async def get_page_content(self) -> str:
         """Get visible text content of the current page."""
         if self._page:
-            async with self._page_lock:
+            async with self._page_action("get_page_content"):
                 return await self._page.evaluate("document.body.innerText")
         return ""
 
@@ -581,14 +1904,41 @@ class BrowserScreenShare:
 
     async def stop(self):
         """Clean up browser and stop capture."""
+        self._stopping = True
+        if self._recovery:
+            self._recovery.cancel()
+        await self._actions.close()
+        if self._running:
+            self._report_metrics(asyncio.get_event_loop().time())
         self._running = False
         if self._capture_task:
             self._capture_task.cancel()
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+        for task in list(self._decode_tasks):
+            task.cancel()
+        await self._close_capture_session()
+        if self._decoder:
+            self._decoder.close()
+        reusable = True
         try:
+            if self._pooled_browser and self._context:
+                # Leaves the pooled browser without this session's pages, cookies or storage
+                await self._context.close()
             if self._browser:
                 await self._browser.close()
             if self._playwright:
                 await self._playwright.stop()
         except Exception as e:
+            reusable = False
             logger.warning(f"Cleanup error (non-fatal): {e}")
+        if self._pooled_browser:
+            # Closing a CDP-attached Browser only disconnects; the pool keeps or terminates the process.
+            # A shared process hosts other rooms, so a cleanup error here must never kill it:
+            # only a dedicated browser that may still hold this session's state is terminated
+            if reusable or isinstance(self._browser_pool, SharedChromium):
+                await asyncio.to_thread(self._browser_pool.release, self._pooled_browser)
+            else:
+                await asyncio.to_thread(self._pooled_browser.close)
+            self._pooled_browser = None
         logger.info("Screen share stopped")
@@ -0,0 +1,101 @@
+"""Spatial index of interactive elements — viewport geometry answered without a page round trip.
+
+Boxes come from the in-page element registry in document coordinates, so scrolling only moves
+the viewport window over the index; DOM mutations arrive as registry deltas.
+"""
+
+CELL_SIZE = 256
+
+
+class SpatialIndex:
+    """Uniform grid of element boxes keyed by registry id.
+
+    Regular elements are stored in document coordinates and bucketed by grid cell. Pinned
+    elements (inside fixed/sticky containers) stay put in the viewport, so they are kept in
+    viewport coordinates outside the grid.
+    """
+
+    def __init__(self, viewport_width: int, viewport_height: int, cell_size: int = CELL_SIZE):
+        self._cell = cell_size
+        self._viewport = (viewport_width, viewport_height)
+        self._boxes: dict[int, tuple[float, float, float, float]] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._pinned: set[int] = set()
+        self.scroll_x = 0.0
+        self.scroll_y = 0.0
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def clear(self):
+        self._boxes.clear()
+        self._cells.clear()
+        self._pinned.clear()
+
+    def set_scroll(self, x: float, y: float):
+        self.scroll_x = x
+        self.scroll_y = y
+
+    def _cells_for(self, x: float, y: float, w: float, h: float):
+        c = self._cell
+        for cx in range(int(x // c), int((x + w) // c) + 1):
+            for cy in range(int(y // c), int((y + h) // c) + 1):
+                yield cx, cy
+
+    def update(self, element_id: int, x: float, y: float, w: float, h: float, pinned: bool = False):
+        """Insert or move an element. x/y are viewport coordinates if pinned, else document."""
+        self.remove(element_id)
+        self._boxes[element_id] = (x, y, w, h)
+        if pinned:
+            self._pinned.add(element_id)
+            return
+        for cell in self._cells_for(x, y, w, h):
+            self._cells.setdefault(cell, set()).add(element_id)
+
+    def remove(self, element_id: int):
+        box = self._boxes.pop(element_id, None)
+        if box is None:
+            return
+        if element_id in self._pinned:
+            self._pinned.discard(element_id)
+            return
+        for cell in self._cells_for(*box):
+            ids = self._cells.get(cell)
+            if ids:
+                ids.discard(element_id)
+                if not ids:
+                    del self._cells[cell]
+
+    def retain(self, element_ids: set[int]):
+        """Drop every element not in element_ids."""
+        for element_id in [i for i in self._boxes if i not in element_ids]:
+            self.remove(element_id)
+
+    def box(self, element_id: int) -> dict | None:
+        """Current viewport box of an element."""
+        box = self._boxes.get(element_id)
+        if box is None:
+            return None
+        x, y, w, h = box
+        if element_id not in self._pinned:
+            x, y = x - self.scroll_x, y - self.scroll_y
+        return {"x": x, "y": y, "width": w, "height": h}
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        """Ids of elements intersecting a viewport rect."""
+        found = set()
+        dx0, dy0 = x0 + self.scroll_x, y0 + self.scroll_y
+        for cell in self._cells_for(dx0, dy0, x1 - x0, y1 - y0):
+            for element_id in self._cells.get(cell, ()):
+                x, y, w, h = self._boxes[element_id]
+                if x < dx0 + (x1 - x0) and x + w > dx0 and y < dy0 + (y1 - y0) and y + h > dy0:
+                    found.add(element_id)
+        for element_id in self._pinned:
+            x, y, w, h = self._boxes[element_id]
+            if x < x1 and x + w > x0 and y < y1 and y + h > y0:
+                found.add(element_id)
+        return list(found)
+
+    def in_viewport(self) -> list[int]:
+        """Ids of elements at least partly on screen at the current scroll offset."""
+        return self.query(0, 0, *self._viewport)
@@ -1,6 +1,5 @@
 """Browser interaction tools for the presenter agent (livekit-agents 1.4.x API)."""
 
-import asyncio
 import json
 import logging
 from urllib.parse import urlparse
@@ -9,8 +8,14 @@ import redis.asyncio as aioredis
 
 from backend.json_logger import setup_json_logger, log_event
 
+logger = logging.getLogger(__name__)
 json_logger = setup_json_logger("presenter.tools", "presenter.log")
 
+# How long get_current_page_guide waits for queued browser actions before scanning the page
+ACTION_WAIT_TIMEOUT = 15.0
+# Elements listed in a scroll's "now on screen" report
+VISIBLE_ELEMENTS_REPORTED = 12
+
 
 def _normalize_path(url: str) -> str:
     """Extract and normalize the path from a URL for wiki lookup."""
@@ -48,7 +53,45 @@ def _lookup_page_wiki(page_wikis: dict, current_url: str) -> tuple[str, dict] |
 
 
 def create_demo_tools(screen_share, room_id: str, redis_url: str = "redis://localhost:6379"):
-    """Create function tools that have access to the screen share and Redis."""
+    """Create function tools that have access to the screen share and Redis.
+
+    Browser actions (click, scroll, highlight) go through screen_share.actions: the tool
+    enqueues the choreography and returns at once so the agent keeps talking while the cursor
+    moves. Outcomes of finished actions are prepended to the next tool result.
+    """
+
+    def _on_action_finished(handle):
+        log_event(json_logger, "browser_action_finished", handle.summary(), {
+            "room_id": room_id,
+            **handle.to_dict(),
+        }, level=logging.INFO if handle.status == "done" else logging.WARNING)
+
+    screen_share.actions.add_listener(_on_action_finished)
+
+    def _with_action_reports(text: str, include_detail: bool = True) -> str:
+        """Prefix a tool result with the outcomes of browser actions finished since the last call."""
+        finished = screen_share.actions.take_finished()
+        if not finished:
+            return text
+        lines = ["Earlier browser actions:"]
+        for handle in finished:
+            lines.append(f"- {handle.summary()}")
+            if include_detail and handle.detail:
+                lines.append(handle.detail)
+        return "\n".join(lines) + "\n\n" + text
+
+    async def _on_screen_summary() -> str | None:
+        """What is on screen after a scroll, from the element index (no page scan if unchanged)."""
+        try:
+            elements = await screen_share.visible_elements()
+        except Exception as e:
+            logger.debug(f"Could not list visible elements: {e}")
+            return None
+        if not elements:
+            return None
+        shown = [f"'{e['text']}' ({e['kind']})" for e in elements[:VISIBLE_ELEMENTS_REPORTED]]
+        more = len(elements) - len(shown)
+        return "Now on screen: " + ", ".join(shown) + (f" and {more} more" if more > 0 else "")
 
     async def _build_page_guide(current_url: str) -> tuple[str, bool, int]:
         """Build a page guide string for the given URL (research wiki + live scan).
@@ -124,9 +167,13 @@ def create_demo_tools(screen_share, room_id: str, redis_url: str = "redis://loca
 
     @function_tool(description="Get a detailed guide for the page currently visible in the browser. Call this EVERY TIME you arrive on a new page. Returns: research context (talking points, value prop) AND a live scan of all clickable elements actually on the page right now.")
     async def get_current_page_guide(context: RunContext) -> str:
+        # The guide must describe the page after any queued clicks/scrolls have played out
+        # (and, right after startup, after the first page has loaded)
+        await screen_share.wait_ready(ACTION_WAIT_TIMEOUT)
+        await screen_share.actions.wait_idle(ACTION_WAIT_TIMEOUT)
         current_url = await screen_share.get_current_url()
         if not current_url:
-            return "Could not determine current page URL."
+            return _with_action_reports("Could not determine current page URL.", include_detail=False)
 
         guide_text, wiki_found, nav_count = await _build_page_guide(current_url)
 
@@ -137,89 +184,104 @@ def create_demo_tools(screen_share, room_id: str, redis_url: str = "redis://loca
             "wiki_found": wiki_found,
             "nav_links": nav_count,
         })
-        return guide_text[:15000]
+        # A click's auto-loaded guide would duplicate this one
+        return _with_action_reports(guide_text[:15000], include_detail=False)
 
-    @function_tool(description="Click a button or link on the page. Pass the element's VISIBLE TEXT (e.g. 'Pricing', 'Start Free Trial', 'Learn More'). The system will find it by role, text, and other matching strategies automatically. If the click causes a page navigation, the new page's guide is automatically included in the response.")
+    @function_tool(description="Click a button or link on the page. Pass the element's VISIBLE TEXT (e.g. 'Pricing', 'Start Free Trial', 'Learn More'). The system will find it by role, text, and other matching strategies automatically. Returns immediately while the cursor moves; whether the click worked, and the new page's guide if it navigated, come back with your next tool call.")
     async def click_element(context: RunContext, selector: str) -> str:
-        url_before = await screen_share.get_current_url()
-        try:
-            await screen_share.click(selector)
-            result = f"Clicked element: {selector}"
-            success = True
-        except Exception as e:
-            result = (
-                f"Could not find element '{selector}'. "
-                "Try using the exact visible text from get_current_page_guide, "
-                "or call get_current_page_guide again to see what's clickable. "
-                "If nothing works, describe the feature verbally and move on."
-            )
-            success = False
-
-        # If the click caused a navigation, auto-load the new page's guide
-        if success:
+        async def run_click():
+            url_before = await screen_share.get_current_url()
+            try:
+                await screen_share.click(selector)
+            except Exception:
+                raise Exception(
+                    f"Could not find element '{selector}'. "
+                    "Try using the exact visible text from get_current_page_guide, "
+                    "or call get_current_page_guide again to see what's clickable. "
+                    "If nothing works, describe the feature verbally and move on."
+                )
+
+            # Let any navigation or re-render the click started play out before looking at the page
+            settled = await screen_share.wait_until_settled()
+
+            # If the click caused a navigation, auto-load the new page's guide
             url_after = await screen_share.get_current_url()
             if url_after and url_before and url_after != url_before:
-                await asyncio.sleep(1.0)  # Wait for new page to render
                 try:
                     guide_text, _, _ = await _build_page_guide(url_after)
-                    result += f"\n\nPAGE CHANGED \u2192 auto-loaded guide for new page:\n{guide_text}"
                     log_event(json_logger, "auto_page_guide", f"Auto-loaded guide after nav to {url_after}", {
                         "room_id": room_id,
                         "from_url": url_before,
                         "to_url": url_after,
+                        "settle_ms": settled["waited_ms"],
                     })
+                    return f"page changed to {url_after}", f"PAGE CHANGED \u2192 auto-loaded guide for new page:\n{guide_text}"
                 except Exception as e:
-                    result += f"\n\n(Page changed to {url_after} but could not load guide: {e})"
+                    return f"page changed to {url_after} but could not load guide: {e}"
+            return "clicked"
 
-        log_event(json_logger, "tool_call", f"click_element: {selector}", {
-            "tool": "click_element",
-            "room_id": room_id,
-            "selector": selector,
-            "success": success,
-            "result": result[:500],
-        })
-        return result
+        return _enqueue("click_element", selector, run_click, f"Clicking '{selector}' now.")
 
-    @function_tool(description="Scroll down the page to show more content.")
+    @function_tool(description="Scroll down the page to show more content. Returns immediately while the page scrolls; the clickable elements now on screen come back with your next tool call.")
     async def scroll_down(context: RunContext, pixels: int = 400) -> str:
-        await screen_share.scroll_down(pixels)
-        log_event(json_logger, "tool_call", f"scroll_down: {pixels}px", {
-            "tool": "scroll_down",
-            "room_id": room_id,
-            "pixels": pixels,
-        })
-        return f"Scrolled down {pixels}px"
+        async def run_scroll():
+            await screen_share.scroll_down(pixels)
+            return f"scrolled {pixels}px", await _on_screen_summary()
 
-    @function_tool(description="Scroll to bring a specific element into view. Pass the element's visible text (e.g. 'Pricing', 'Contact Us'). The system finds it automatically.")
-    async def scroll_to_element(context: RunContext, selector: str) -> str:
-        try:
-            await screen_share.scroll_to_element(selector)
-            result = f"Scrolled to {selector}"
-            success = True
-        except Exception as e:
-            result = (
-                f"Could not find element '{selector}'. "
-                "Try scroll_down instead to scroll by pixels."
-            )
-            success = False
-        log_event(json_logger, "tool_call", f"scroll_to_element: {selector}", {
-            "tool": "scroll_to_element",
-            "room_id": room_id,
-            "selector": selector,
-            "success": success,
-            "result": result,
-        })
-        return result
+        return _enqueue("scroll_down", f"{pixels}px", run_scroll, f"Scrolling down {pixels}px.")
 
-    @function_tool(description="Highlight an element on the page with an orange outline. Pass the element's visible text (e.g. 'Start Free Trial').")
+    @function_tool(description="Scroll to bring a specific element into view. Pass the element's visible text (e.g. 'Pricing', 'Contact Us'). The system finds it automatically. Returns immediately while the page scrolls; the clickable elements now on screen come back with your next tool call.")
+    async def scroll_to_element(context: RunContext, selector: str) -> str:
+        async def run_scroll_to():
+            try:
+                await screen_share.scroll_to_element(selector)
+            except Exception:
+                raise Exception(
+                    f"Could not find element '{selector}'. "
+                    "Try scroll_down instead to scroll by pixels."
+                )
+            return "in view", await _on_screen_summary()
+
+        return _enqueue("scroll_to_element", selector, run_scroll_to, f"Scrolling to '{selector}'.")
+
+    @function_tool(description="Highlight an element on the page with an orange outline. Pass the element's visible text (e.g. 'Start Free Trial'). Returns immediately while the cursor moves.")
     async def highlight_element(context: RunContext, selector: str) -> str:
-        await screen_share.highlight_element(selector)
-        log_event(json_logger, "tool_call", f"highlight_element: {selector}", {
-            "tool": "highlight_element",
+        async def run_highlight():
+            await screen_share.highlight_element(selector)
+            return "highlighted"
+
+        return _enqueue("highlight_element", selector, run_highlight, f"Highlighting '{selector}'.")
+
+    def _enqueue(tool: str, target: str, fn, message: str) -> str:
+        """Queue a browser action and build the immediate tool result."""
+        async def run_when_ready():
+            # The track goes live before the first page has loaded
+            if not await screen_share.wait_ready(ACTION_WAIT_TIMEOUT):
+                raise Exception("the browser is still loading the page")
+            return await fn()
+
+        try:
+            handle = screen_share.actions.submit(tool, f"{tool}('{target}')", run_when_ready)
+        except RuntimeError as e:
+            log_event(json_logger, "tool_call", f"{tool}: {target} (rejected)", {
+                "tool": tool,
+                "room_id": room_id,
+                "target": target,
+                "queued": False,
+                "error": str(e),
+            }, level=logging.WARNING)
+            return _with_action_reports(f"Browser is busy ({e}). Wait a moment, then try again.")
+        log_event(json_logger, "tool_call", f"{tool}: {target}", {
+            "tool": tool,
             "room_id": room_id,
-            "selector": selector,
+            "target": target,
+            "action_id": handle.id,
+            "queued": True,
         })
-        return f"Highlighted {selector}"
+        return _with_action_reports(
+            f"{message} (action #{handle.id}, running in the background — keep talking; "
+            "its outcome comes back with your next tool call)"
+        )
 
     @function_tool(description="Get the latest research context about the website. Call this when you need more information to answer a user's question.")
     async def get_research_context(context: RunContext) -> str:
@@ -0,0 +1,128 @@
+"""Crawl frontier — canonical, deduplicated URLs handed out best-first.
+
+The crawl budget is small, so which pages get crawled matters more than how many links a
+site has. Links are canonicalized and deduplicated when they are enqueued, and scored so that
+navigation links and demo-relevant pages (pricing, features, product, ...) come before
+footer, legal and blog links.
+"""
+
+import heapq
+import re
+from urllib.parse import urljoin, urlsplit
+
+# Path keywords worth presenting, and their score bonus
+DEMO_KEYWORDS = {
+    "pricing": 40, "plans": 35, "features": 35, "product": 30, "products": 30,
+    "platform": 25, "solutions": 25, "how-it-works": 25, "tour": 25, "demo": 20,
+    "integrations": 20, "use-cases": 20, "customers": 15, "security": 10, "enterprise": 15,
+    "about": 5,
+}
+# Pages that rarely help a product demo
+LOW_VALUE_KEYWORDS = {
+    "privacy": -40, "terms": -40, "legal": -40, "cookie": -40, "cookies": -40, "gdpr": -30,
+    "careers": -30, "jobs": -30, "press": -20, "login": -30, "signin": -30, "sign-in": -30,
+    "signup": -20, "sign-up": -20, "register": -20, "status": -20, "sitemap": -30,
+    "blog": -15, "news": -15, "tag": -25, "author": -25, "category": -15,
+}
+NAV_BONUS = 30
+BASE_SCORE = 50
+# Per path segment beyond the first
+DEPTH_PENALTY = 8
+SKIPPED_EXTENSIONS = (
+    ".pdf", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico", ".zip", ".gz", ".dmg",
+    ".exe", ".mp4", ".mov", ".mp3", ".xml", ".json", ".css", ".js", ".rss",
+)
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+_WORD_SPLIT = re.compile(r"[^a-z0-9]+")
+# Longest keyword in words ("how-it-works")
+_MAX_KEYWORD_WORDS = max(k.count("-") + 1 for k in {**DEMO_KEYWORDS, **LOW_VALUE_KEYWORDS})
+
+
+def canonicalize_url(href: str, base_url: str | None = None) -> str | None:
+    """Absolute scheme://host/path form of a link, or None if it is not a crawlable page.
+
+    Rules: resolved against base_url; scheme and host lowercased, default ports dropped;
+    query and fragment dropped (page wikis are keyed by path); trailing slash removed except
+    for the root; repeated slashes collapsed; non-HTTP links and file downloads rejected.
+    """
+    url = urljoin(base_url, href.strip()) if base_url else href.strip()
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return None
+    netloc = parts.netloc.lower()
+    default_port = _DEFAULT_PORTS[scheme]
+    if netloc.endswith(default_port):
+        netloc = netloc[: -len(default_port)]
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    if path.lower().endswith(SKIPPED_EXTENSIONS):
+        return None
+    if path != "/":
+        path = path.rstrip("/")
+    return f"{scheme}://{netloc}{path}"
+
+
+def _keywords(text: str) -> set[str]:
+    """Words of a path or link text, plus runs of words joined with "-" to match multi-word
+    keywords: "/pricing-plans" and "Pricing plans" both give pricing, plans, pricing-plans."""
+    words = [w for w in _WORD_SPLIT.split(text.lower()) if w]
+    return {
+        "-".join(words[i:i + n])
+        for n in range(1, _MAX_KEYWORD_WORDS + 1)
+        for i in range(len(words) - n + 1)
+    }
+
+
+def score_link(url: str, in_nav: bool = False, text: str = "") -> int:
+    """Crawl priority of a canonical URL; higher is crawled first."""
+    path = urlsplit(url).path.lower()
+    segments = [s for s in path.split("/") if s]
+    words = _keywords(path) | _keywords(text)
+    score = BASE_SCORE
+    if in_nav:
+        score += NAV_BONUS
+    score += max((DEMO_KEYWORDS[w] for w in words if w in DEMO_KEYWORDS), default=0)
+    score += min((LOW_VALUE_KEYWORDS[w] for w in words if w in LOW_VALUE_KEYWORDS), default=0)
+    score -= DEPTH_PENALTY * max(0, len(segments) - 1)
+    return score
+
+
+class CrawlFrontier:
+    """Priority queue of canonical URLs with enqueue-time dedupe.
+
+    A URL is queued at most once; finding it again with a higher score (e.g. first seen in
+    the footer, later in the nav) raises its priority instead of adding a duplicate.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[int, int, str]] = []
+        self._best: dict[str, int] = {}
+        self._taken: set[str] = set()
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._best or url in self._taken
+
+    def push(self, url: str, score: int) -> bool:
+        """Queue url (canonical). Returns False if it was already taken or queued at >= score."""
+        if url in self._taken or self._best.get(url, score - 1) >= score:
+            return False
+        self._best[url] = score
+        # The sequence number keeps equal scores in discovery order
+        heapq.heappush(self._heap, (-score, self._seq, url))
+        self._seq += 1
+        return True
+
+    def pop(self) -> str | None:
+        """Highest-scoring queued URL (marked taken), or None when empty."""
+        while self._heap:
+            neg_score, _, url = heapq.heappop(self._heap)
+            if self._best.get(url) != -neg_score:
+                continue  # superseded by a higher-score push
+            del self._best[url]
+            self._taken.add(url)
+            return url
+        return None
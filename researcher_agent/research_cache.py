@@ -0,0 +1,132 @@
+"""Cross-room research cache in Redis — repeat demos of a site reuse earlier crawls.
+
+Three kinds of entries, all expiring after the TTL and sharing one LRU index:
+  * page:   extract_page_knowledge output, keyed by normalized URL + a hash of what the
+            extraction saw (title, content, dom_elements), so only changed pages re-extract
+  * script: generate_demo_script output, keyed by a hash of the combined knowledge
+  * site:   the last complete research result for a start URL, published straight away to a
+            new room while the site is re-crawled in the background
+
+The LRU index is a sorted set of cache keys scored by last use; writes trim it to max_entries.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extraction or script prompts change, so old results are not reused
+CACHE_VERSION = "v1"
+KEY_PREFIX = f"research_cache:{CACHE_VERSION}"
+LRU_KEY = f"{KEY_PREFIX}:lru"
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+
+
+def normalize_cache_url(url: str) -> str:
+    """scheme://host/path with lowercase scheme/host, no query, fragment or trailing slash."""
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") or "/"
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}"
+
+
+def _digest(data) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def page_fingerprint(page_data: dict) -> str:
+    """Hash of everything extract_page_knowledge reads from a crawled page."""
+    return _digest({
+        "title": page_data.get("title", ""),
+        "content": page_data.get("content", ""),
+        "dom_elements": page_data.get("dom_elements", {}),
+    })
+
+
+def knowledge_hash(website_url: str, combined_knowledge: dict) -> str:
+    return _digest({"website_url": normalize_cache_url(website_url), "knowledge": combined_knowledge})
+
+
+class ResearchCache:
+    """Redis-backed research cache. ttl=0 disables it (every lookup misses, nothing is stored)."""
+
+    def __init__(self, r, ttl: int = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._r = r
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    async def _get(self, key: str) -> dict | None:
+        if not self.enabled:
+            return None
+        try:
+            raw = await self._r.get(key)
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # A hit counts as a use: refresh both the LRU score and the TTL
+            await self._r.zadd(LRU_KEY, {key: time.time()})
+            await self._r.expire(key, self._ttl)
+            return json.loads(raw)
+        except Exception as e:
+            logger.warning(f"Research cache read failed for {key}: {e}")
+            return None
+
+    async def _put(self, key: str, value: dict):
+        if not self.enabled:
+            return
+        try:
+            now = time.time()
+            await self._r.set(key, json.dumps(value), ex=self._ttl)
+            await self._r.zadd(LRU_KEY, {key: now})
+            await self._evict(now)
+        except Exception as e:
+            logger.warning(f"Research cache write failed for {key}: {e}")
+
+    async def _evict(self, now: float):
+        # Index entries whose keys have already expired
+        await self._r.zremrangebyscore(LRU_KEY, 0, now - self._ttl)
+        excess = await self._r.zcard(LRU_KEY) - self._max_entries
+        if excess > 0:
+            victims = await self._r.zrange(LRU_KEY, 0, excess - 1)
+            if victims:
+                await self._r.delete(*victims)
+                await self._r.zrem(LRU_KEY, *victims)
+
+    @staticmethod
+    def _page_key(page_data: dict) -> str:
+        return f"{KEY_PREFIX}:page:{normalize_cache_url(page_data['url'])}:{page_fingerprint(page_data)}"
+
+    async def get_page_knowledge(self, page_data: dict) -> dict | None:
+        return await self._get(self._page_key(page_data))
+
+    async def put_page_knowledge(self, page_data: dict, knowledge: dict):
+        await self._put(self._page_key(page_data), knowledge)
+
+    async def get_demo_script(self, knowledge_digest: str) -> dict | None:
+        return await self._get(f"{KEY_PREFIX}:script:{knowledge_digest}")
+
+    async def put_demo_script(self, knowledge_digest: str, demo_script: dict):
+        await self._put(f"{KEY_PREFIX}:script:{knowledge_digest}", demo_script)
+
+    async def get_site(self, website_url: str) -> dict | None:
+        """Last complete research for a start URL: {"knowledge_hash", "research"}."""
+        return await self._get(f"{KEY_PREFIX}:site:{normalize_cache_url(website_url)}")
+
+    async def put_site(self, website_url: str, knowledge_digest: str, research: dict):
+        await self._put(f"{KEY_PREFIX}:site:{normalize_cache_url(website_url)}", {
+            "knowledge_hash": knowledge_digest,
+            "research": research,
+        })
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
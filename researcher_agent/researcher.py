@@ -4,6 +4,8 @@ import asyncio
 import json
 import logging
 import os
+import time
+from collections.abc import Awaitable, Callable
 from urllib.parse import urljoin, urlparse
 
 from dotenv import load_dotenv
@@ -14,15 +16,58 @@ from playwright.async_api import async_playwright
 import redis.asyncio as aioredis
 
 from researcher_agent.extractor import extract_page_knowledge
+from researcher_agent.frontier import CrawlFrontier, canonicalize_url, score_link
+from researcher_agent.research_cache import ResearchCache, knowledge_hash
+from researcher_agent.static_fetch import StaticFetcher
 from researcher_agent.summarizer import generate_demo_script
 
 from backend.json_logger import setup_json_logger, log_event
+from backend.page_settle import PageSettle
 
 logger = setup_json_logger("researcher", "researcher.log")
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
 ANTHROPIC_API_KEY = os.environ["ANTHROPIC_API_KEY"]
-MAX_PAGES = 4
+MAX_PAGES = int(os.environ.get("RESEARCH_MAX_PAGES", "20"))
+# Pages crawled at once. The crawl stays on the start URL's host, so this is also the load
+# put on that one site
+CRAWL_CONCURRENCY = int(os.environ.get("CRAWL_CONCURRENCY", "4"))
+# The whole crawl stops taking new pages after this many seconds
+CRAWL_DEADLINE = float(os.environ.get("CRAWL_DEADLINE", "45"))
+PAGE_GOTO_TIMEOUT = 20.0
+# Fetch pages over plain HTTP first and render only JS-dependent ones in Chromium
+STATIC_FETCH = os.environ.get("STATIC_FETCH", "1") != "0"
+# Claude extractions running at once, and at most this many started per minute
+EXTRACT_CONCURRENCY = int(os.environ.get("EXTRACT_CONCURRENCY", "4"))
+EXTRACT_RATE_PER_MINUTE = float(os.environ.get("EXTRACT_RATE_PER_MINUTE", "40"))
+# Cross-room research cache (seconds; 0 disables) and its LRU size in entries
+RESEARCH_CACHE_TTL = int(os.environ.get("RESEARCH_CACHE_TTL", str(24 * 3600)))
+RESEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("RESEARCH_CACHE_MAX_ENTRIES", "2000"))
+
+
+class RateLimiter:
+    """Token bucket: bursts of up to `burst` calls, then at most rate_per_minute on average."""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self._rate = rate_per_minute / 60.0
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self._rate <= 0:
+            return
+        # Callers are served in arrival order; the lock is held while waiting for a token
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
 
 
 def normalize_url_path(url: str) -> str:
@@ -116,65 +161,157 @@ EXTRACT_DOM_ELEMENTS_JS = """
 """
 
 
-async def crawl_pages(browser, start_url: str) -> list[dict]:
-    """Crawl the website starting from the given URL, collecting page data and real DOM elements."""
-    visited = set()
+async def crawl_pages(browser, start_url: str,
+                      on_page: Callable[[dict], Awaitable[None]] | None = None) -> list[dict]:
+    """Crawl the website starting from the given URL, collecting page data and real DOM elements.
+
+    CRAWL_CONCURRENCY workers pull the best-scoring URL from a shared CrawlFrontier until
+    MAX_PAGES pages are crawled, the frontier runs dry or CRAWL_DEADLINE passes. With STATIC_FETCH each page is first fetched over HTTP; a worker
+    only opens a browser tab for pages that need JavaScript to render. on_page is
+    awaited with each page's data as soon as that page is done. Returns pages in discovery
+    order, so the start page comes first.
+    """
+    deadline = time.monotonic() + CRAWL_DEADLINE
     pages_data = []
-    to_visit = [start_url]
+    start_url = canonicalize_url(start_url) or start_url
+    frontier = CrawlFrontier()
+    frontier.push(start_url, score=1_000_000)
     base_domain = urlparse(start_url).netloc
+    # Discovery order of each URL, used to sort the results
+    order = {start_url: 0}
+    # Pages being crawled right now plus pages done; a failed page gives its slot back
+    claimed = 0
+    in_flight = 0
+    frontier_changed = asyncio.Condition()
+
+    async def next_url() -> str | None:
+        """Claim the best queued URL, waiting while in-flight pages may still add links."""
+        nonlocal claimed, in_flight
+        async with frontier_changed:
+            while True:
+                if claimed >= MAX_PAGES or time.monotonic() >= deadline:
+                    return None
+                url = frontier.pop()
+                if url is not None:
+                    claimed += 1
+                    in_flight += 1
+                    return url
+                if in_flight == 0:
+                    return None
+                try:
+                    await asyncio.wait_for(frontier_changed.wait(), deadline - time.monotonic())
+                except asyncio.TimeoutError:
+                    return None
+
+    async def finish(url: str, links: list[tuple[str, int]], ok: bool):
+        nonlocal claimed, in_flight
+        async with frontier_changed:
+            in_flight -= 1
+            if not ok:
+                claimed -= 1
+            for link, score in links:
+                if frontier.push(link, score):
+                    order.setdefault(link, len(order))
+            frontier_changed.notify_all()
+
+    async def render(tab: dict, url: str) -> tuple[str, str, dict, dict]:
+        """Load url in this worker's browser tab, opened on first use."""
+        if "page" not in tab:
+            tab["page"] = await browser.new_page(viewport={"width": 1280, "height": 720})
+            tab["settle"] = PageSettle(tab["page"])
+        page = tab["page"]
+        timeout = max(1.0, min(PAGE_GOTO_TIMEOUT, deadline - time.monotonic()))
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+        settled = await tab["settle"].wait(min(5.0, max(0.5, deadline - time.monotonic())))  # Let JS render
+
+        title = await page.title()
+        content = await page.evaluate("document.body.innerText")
+
+        # Extract real interactive elements from the DOM
+        dom_elements = await page.evaluate(EXTRACT_DOM_ELEMENTS_JS)
+        return title, content, dom_elements, settled
+
+    async def crawl_one(tab: dict, url: str) -> tuple[dict, list[tuple[str, int]]]:
+        static_page, escalation, settled = None, None, None
+        # Server-rendered pages are read over HTTP; JS-dependent ones fall through to the browser
+        if fetcher:
+            static_page, escalation = await fetcher.fetch(url)
+        if static_page:
+            title, content, dom_elements = static_page["title"], static_page["content"], static_page["dom_elements"]
+        else:
+            title, content, dom_elements, settled = await render(tab, url)
+
+        # Collect internal links for crawl queue, scored for the frontier
+        all_links = dom_elements.get("nav_links", []) + dom_elements.get("other_links", [])
+        link_hrefs = [l["href"] for l in all_links if l.get("href", "").startswith("http")]
+        internal = []
+        for link in all_links:
+            clean_url = canonicalize_url(link.get("href", ""), url)
+            if clean_url and urlparse(clean_url).netloc == base_domain:
+                internal.append((clean_url, score_link(clean_url, link.get("in_nav", False), link.get("text", ""))))
+
+        page_data = {
+            "url": url,
+            "title": title,
+            "content": content[:20000],
+            "dom_elements": dom_elements,
+        }
+        log_event(logger, "page_crawled", f"Crawled: {title} ({url})", {
+            "url": url,
+            "title": title,
+            "content_length": len(content),
+            "links_found": len(link_hrefs),
+            "nav_links": len(dom_elements.get("nav_links", [])),
+            "buttons": len(dom_elements.get("buttons", [])),
+            "pages_crawled_so_far": len(pages_data) + 1,
+            "via": "http" if static_page else "browser",
+            "escalation": escalation,
+            "settle_ms": settled["waited_ms"] if settled else None,
+            "settled": settled["settled"] if settled else None,
+        })
+        return page_data, internal
 
-    page = await browser.new_page(viewport={"width": 1280, "height": 720})
-
-    while to_visit and len(pages_data) < MAX_PAGES:
-        url = to_visit.pop(0)
-        if url in visited:
-            continue
-        visited.add(url)
-
+    async def worker():
+        tab = {}
         try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-            await asyncio.sleep(1)  # Let JS render
-
-            title = await page.title()
-            content = await page.evaluate("document.body.innerText")
-
-            # Extract real interactive elements from the DOM
-            dom_elements = await page.evaluate(EXTRACT_DOM_ELEMENTS_JS)
-
-            # Collect internal links for crawl queue
-            all_links = dom_elements.get("nav_links", []) + dom_elements.get("other_links", [])
-            link_hrefs = [l["href"] for l in all_links if l.get("href", "").startswith("http")]
-
-            pages_data.append({
-                "url": url,
-                "title": title,
-                "content": content[:20000],
-                "dom_elements": dom_elements,
-            })
-            log_event(logger, "page_crawled", f"Crawled: {title} ({url})", {
-                "url": url,
-                "title": title,
-                "content_length": len(content),
-                "links_found": len(link_hrefs),
-                "nav_links": len(dom_elements.get("nav_links", [])),
-                "buttons": len(dom_elements.get("buttons", [])),
-                "pages_crawled_so_far": len(pages_data),
+            while (url := await next_url()) is not None:
+                try:
+                    page_data, links = await crawl_one(tab, url)
+                except Exception as e:
+                    log_event(logger, "crawl_failed", f"Failed to crawl {url}: {e}", {
+                        "url": url,
+                        "error": str(e),
+                    }, level=logging.WARNING)
+                    await finish(url, [], ok=False)
+                    continue
+                pages_data.append(page_data)
+                await finish(url, links, ok=True)
+                if on_page:
+                    await on_page(page_data)
+        finally:
+            if "page" in tab:
+                await tab["page"].close()
+
+    fetcher = StaticFetcher() if STATIC_FETCH else None
+    try:
+        async with asyncio.TaskGroup() as tasks:
+            for _ in range(max(1, CRAWL_CONCURRENCY)):
+                tasks.create_task(worker())
+    finally:
+        if fetcher:
+            await fetcher.close()
+            log_event(logger, "static_fetch_stats", f"{fetcher.static_pages} pages over HTTP, "
+                      f"{fetcher.escalations} escalated to the browser", {
+                "url": start_url,
+                **fetcher.stats(),
             })
-
-            # Add internal links to visit queue
-            for href in link_hrefs:
-                parsed = urlparse(href)
-                clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                if parsed.netloc == base_domain and clean_url not in visited:
-                    to_visit.append(clean_url)
-
-        except Exception as e:
-            log_event(logger, "crawl_failed", f"Failed to crawl {url}: {e}", {
-                "url": url,
-                "error": str(e),
-            }, level=logging.WARNING)
-
-    await page.close()
+    if time.monotonic() >= deadline:
+        log_event(logger, "crawl_deadline", f"Crawl stopped at the {CRAWL_DEADLINE}s deadline", {
+            "url": start_url,
+            "pages_crawled": len(pages_data),
+            "frontier": len(frontier),
+        }, level=logging.WARNING)
+    pages_data.sort(key=lambda pd: order.get(pd["url"], len(order)))
     return pages_data
 
 
@@ -182,63 +319,123 @@ async def research_website(room_id: str, website_url: str):
     """Main research pipeline — crawl, extract, summarize, publish."""
     r = aioredis.from_url(REDIS_URL, decode_responses=True)
     client = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
-
-    # Publish initial status
-    await r.set(
-        f"research:{room_id}",
-        json.dumps({"status": "researching", "knowledge": {}, "demo_script": ""}),
-    )
+    cache = ResearchCache(r, RESEARCH_CACHE_TTL, RESEARCH_CACHE_MAX_ENTRIES)
+
+    # A site researched before is published straight away and re-crawled in the background;
+    # only pages whose content changed are re-extracted, and it is republished only if
+    # the knowledge changed
+    cached_site = await cache.get_site(website_url)
+    if cached_site:
+        cached_research = cached_site["research"]
+        await r.set(f"research:{room_id}", json.dumps(cached_research))
+        await r.publish(f"research_updates:{room_id}", json.dumps(cached_research))
+        log_event(logger, "research_cache_hit", f"Published cached research for {website_url}", {
+            "room_id": room_id,
+            "website_url": website_url,
+            "pages": len(cached_research.get("page_wikis", {})),
+        })
+    else:
+        # Publish initial status
+        await r.set(
+            f"research:{room_id}",
+            json.dumps({"status": "researching", "knowledge": {}, "demo_script": ""}),
+        )
 
     async with async_playwright() as pw:
         browser = await pw.chromium.launch(headless=True)
 
-        # Step 1: Crawl pages
+        # Steps 1 + 2: crawl pages and extract knowledge from each as soon as it is crawled
+        # (pass real DOM elements). Crawled pages queue up for a pool of extraction workers.
         log_event(logger, "crawl_start", f"Starting crawl of {website_url}", {
             "room_id": room_id,
             "website_url": website_url,
             "max_pages": MAX_PAGES,
         })
-        pages_data = await crawl_pages(browser, website_url)
-        log_event(logger, "crawl_complete", f"Crawled {len(pages_data)} pages", {
+        pipeline_start = time.monotonic()
+        crawled: asyncio.Queue[dict | None] = asyncio.Queue()
+        crawled_pages = []
+        knowledge_by_url: dict[str, dict] = {}
+        crawl_done = False
+        rate_limiter = RateLimiter(EXTRACT_RATE_PER_MINUTE, burst=EXTRACT_CONCURRENCY)
+        # Snapshots are built and written under one lock so a slower write never overwrites a newer one
+        publish_lock = asyncio.Lock()
+
+        async def on_page(page_data: dict):
+            crawled_pages.append(page_data)
+            await crawled.put(page_data)
+
+        async def crawl():
+            nonlocal crawl_done
+            try:
+                return await crawl_pages(browser, website_url, on_page)
+            finally:
+                crawl_done = True
+                for _ in range(EXTRACT_CONCURRENCY):
+                    await crawled.put(None)
+
+        async def extract_worker():
+            while (page_data := await crawled.get()) is not None:
+                knowledge = await cache.get_page_knowledge(page_data)
+                cached = knowledge is not None
+                if not cached:
+                    await rate_limiter.acquire()
+                    knowledge = await extract_page_knowledge(
+                        client,
+                        page_data["url"],
+                        page_data["title"],
+                        page_data["content"],
+                        page_data.get("dom_elements", {}),
+                    )
+                    # Failed extractions come back as a fallback dict; don't pin those
+                    if "error" not in knowledge:
+                        await cache.put_page_knowledge(page_data, knowledge)
+                knowledge_by_url[page_data["url"]] = knowledge
+                log_event(logger, "knowledge_extracted", f"Extracted knowledge from {page_data['url']}", {
+                    "room_id": room_id,
+                    "page_url": page_data["url"],
+                    "features_count": len(knowledge.get("key_features", [])),
+                    "highlights_count": len(knowledge.get("demo_highlights", [])),
+                    "talking_points_count": len(knowledge.get("demo_talking_points", [])),
+                    "elapsed_ms": round((time.monotonic() - pipeline_start) * 1000),
+                    "cached": cached,
+                })
+
+                # The room already has complete (cached) research; don't step it back to "extracting"
+                if cached_site:
+                    continue
+                # Publish incremental updates (include page_wikis so presenter can use them immediately)
+                async with publish_lock:
+                    extracted = list(knowledge_by_url.values())
+                    await r.set(
+                        f"research:{room_id}",
+                        json.dumps({
+                            "status": "extracting",
+                            "knowledge": {
+                                "pages_analyzed": len(extracted),
+                                "total_pages": len(crawled_pages),
+                                "crawl_complete": crawl_done,
+                                "pages": extracted,
+                            },
+                            "demo_script": "",
+                            "page_wikis": build_page_wikis(extracted, crawled_pages),
+                        }),
+                    )
+
+        # A failure in the crawl or any worker cancels the rest before the browser is closed
+        async with asyncio.TaskGroup() as tasks:
+            crawl_task = tasks.create_task(crawl())
+            for _ in range(EXTRACT_CONCURRENCY):
+                tasks.create_task(extract_worker())
+        pages_data = crawl_task.result()
+        # Crawl (discovery) order, so the start page's knowledge comes first
+        all_knowledge = [knowledge_by_url[pd["url"]] for pd in pages_data if pd["url"] in knowledge_by_url]
+        log_event(logger, "crawl_complete", f"Crawled and extracted {len(pages_data)} pages", {
             "room_id": room_id,
             "pages_crawled": len(pages_data),
+            "pages_extracted": len(all_knowledge),
+            "elapsed_ms": round((time.monotonic() - pipeline_start) * 1000),
         })
 
-        # Step 2: Extract knowledge from each page (pass real DOM elements)
-        all_knowledge = []
-        for page_data in pages_data:
-            knowledge = await extract_page_knowledge(
-                client,
-                page_data["url"],
-                page_data["title"],
-                page_data["content"],
-                page_data.get("dom_elements", {}),
-            )
-            all_knowledge.append(knowledge)
-            log_event(logger, "knowledge_extracted", f"Extracted knowledge from {page_data['url']}", {
-                "room_id": room_id,
-                "page_url": page_data["url"],
-                "features_count": len(knowledge.get("key_features", [])),
-                "highlights_count": len(knowledge.get("demo_highlights", [])),
-                "talking_points_count": len(knowledge.get("demo_talking_points", [])),
-            })
-
-            # Publish incremental updates (include page_wikis so presenter can use them immediately)
-            incremental_wikis = build_page_wikis(all_knowledge, pages_data)
-            await r.set(
-                f"research:{room_id}",
-                json.dumps({
-                    "status": "extracting",
-                    "knowledge": {
-                        "pages_analyzed": len(all_knowledge),
-                        "total_pages": len(pages_data),
-                        "pages": all_knowledge,
-                    },
-                    "demo_script": "",
-                    "page_wikis": incremental_wikis,
-                }),
-            )
-
         # Step 3: Combine knowledge and generate demo script
         combined_knowledge = {
             "product_name": all_knowledge[0].get("main_heading", "Unknown") if all_knowledge else "Unknown",
@@ -250,12 +447,29 @@ async def research_website(room_id: str, website_url: str):
         # Aggregate and deduplicate features across pages
         for k in all_knowledge:
             combined_knowledge["all_features"].extend(k.get("key_features", []))
-        combined_knowledge["all_features"] = list(set(combined_knowledge["all_features"]))
+        # Sorted so identical knowledge always hashes the same
+        combined_knowledge["all_features"] = sorted(set(combined_knowledge["all_features"]))
 
-        log_event(logger, "demo_script_generating", "Generating demo script...", {
-            "room_id": room_id,
-        })
-        demo_script = await generate_demo_script(client, website_url, combined_knowledge)
+        digest = knowledge_hash(website_url, combined_knowledge)
+        if cached_site and digest == cached_site["knowledge_hash"]:
+            log_event(logger, "research_unchanged", f"Site unchanged since cached research for {website_url}", {
+                "room_id": room_id,
+                "pages_analyzed": len(all_knowledge),
+                "cache": cache.stats(),
+            })
+            await monitor_requests(browser, client, r, room_id, website_url)
+            await browser.close()
+            return
+
+        demo_script = await cache.get_demo_script(digest)
+        if demo_script is None:
+            log_event(logger, "demo_script_generating", "Generating demo script...", {
+                "room_id": room_id,
+            })
+            demo_script = await generate_demo_script(client, website_url, combined_knowledge)
+            # generate_demo_script falls back to a generic "Unknown" script on failure; don't pin it
+            if demo_script.get("product_name", "Unknown") != "Unknown":
+                await cache.put_demo_script(digest, demo_script)
 
         # Update product name from demo script if available
         if demo_script.get("product_name") and demo_script["product_name"] != "Unknown":
@@ -277,12 +491,14 @@ async def research_website(room_id: str, website_url: str):
         }
         await r.set(f"research:{room_id}", json.dumps(final_data))
         await r.publish(f"research_updates:{room_id}", json.dumps(final_data))
+        await cache.put_site(website_url, digest, final_data)
         log_event(logger, "research_complete", f"Research complete for room {room_id}", {
             "room_id": room_id,
             "pages_analyzed": len(all_knowledge),
             "total_features": len(combined_knowledge.get("all_features", [])),
             "demo_steps": len(demo_script.get("demo_steps", [])),
             "product_name": demo_script.get("product_name", "Unknown"),
+            "cache": cache.stats(),
         })
 
         # Step 5: Monitor for deep dive requests
@@ -317,11 +533,12 @@ async def monitor_requests(browser, client, r, room_id: str, base_url: str):
 
                 # Research the specific topic
                 page = await browser.new_page(viewport={"width": 1280, "height": 720})
+                settle = PageSettle(page)
                 try:
                     # Try navigating to a relevant sub-page
                     search_url = f"{base_url.rstrip('/')}/{topic.lower().replace(' ', '-')}"
                     await page.goto(search_url, wait_until="domcontentloaded", timeout=10000)
-                    await asyncio.sleep(1)
+                    await settle.wait()
                     content = await page.evaluate("document.body.innerText")
                     title = await page.title()
                     dom_elements = await page.evaluate(EXTRACT_DOM_ELEMENTS_JS)
@@ -0,0 +1,256 @@
+"""HTTP-first page fetch — server-rendered pages without a browser.
+
+Most marketing sites serve complete HTML. StaticFetcher GETs pages over a pooled httpx client
+and parses text, title and the same nav_links / buttons / other_links structure that
+EXTRACT_DOM_ELEMENTS_JS produces. Pages that depend on JavaScript (SPA shells, near-empty
+bodies, "enable JavaScript" notices) are reported with an escalation reason so the crawler
+renders them in Playwright instead.
+
+Static HTML has no layout, so "visible" means not inside hidden / aria-hidden / display:none
+markup rather than a non-zero bounding box.
+"""
+
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+FETCH_TIMEOUT = 10.0
+MAX_CONNECTIONS = 20
+MAX_HTML_BYTES = 3 * 1024 * 1024
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+# Less visible text than this means the content is probably rendered by scripts
+MIN_STATIC_TEXT = 400
+# Text per script tag below which a page looks like an app shell
+MIN_TEXT_PER_SCRIPT = 150
+MIN_STATIC_LINKS = 3
+# Mount points of common client-side frameworks
+SPA_ROOT_IDS = {"root", "app", "__next", "__nuxt", "___gatsby", "svelte", "main-app"}
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source",
+    "track", "wbr",
+}
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "nav", "main", "aside", "li", "ul",
+    "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "table", "form", "blockquote",
+}
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+class _PageParser(HTMLParser):
+    """Collects visible text, title, links and buttons in one pass."""
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.title = ""
+        self.text: list[str] = []
+        self.nav_links: list[dict] = []
+        self.other_links: list[dict] = []
+        self.buttons: list[dict] = []
+        self.scripts = 0
+        self.noscript_text: list[str] = []
+        self.empty_roots = 0
+        # Open elements: (tag, in_nav, hidden, skipped)
+        self._stack: list[tuple[str, bool, bool, bool]] = []
+        self._in_title = False
+        # Element whose text is being collected: (kind, attrs, parts, depth)
+        self._capture: tuple[str, dict, list[str], int] | None = None
+        self._root_depths: list[tuple[int, int]] = []
+
+    @property
+    def _flags(self) -> tuple[bool, bool, bool]:
+        if self._stack:
+            return self._stack[-1][1:]
+        return False, False, False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v or "") for k, v in attrs}
+        if tag == "base" and attrs.get("href"):
+            self.base_url = urljoin(self.base_url, attrs["href"])
+        if tag == "script":
+            self.scripts += 1
+        if tag == "title":
+            self._in_title = True
+        in_nav, hidden, skipped = self._flags
+        in_nav = in_nav or tag == "nav" or attrs.get("role") == "navigation"
+        hidden = hidden or "hidden" in attrs or attrs.get("aria-hidden") == "true" or bool(
+            _HIDDEN_STYLE.search(attrs.get("style", ""))
+        )
+        skipped = skipped or (tag in _SKIP_TAGS and tag != "noscript")
+
+        if tag == "input" and not hidden and not skipped:
+            if attrs.get("type", "").lower() in ("submit", "button"):
+                label = (attrs.get("value") or attrs.get("aria-label", "")).strip()
+                if label and len(label) <= 100:
+                    self.buttons.append({"text": label})
+        if tag in _VOID_TAGS:
+            if tag == "br":
+                self.text.append("\n")
+            return
+
+        self._stack.append((tag, in_nav, hidden, skipped))
+        if tag in _BLOCK_TAGS:
+            self.text.append("\n")
+        if attrs.get("id") in SPA_ROOT_IDS:
+            self._root_depths.append((len(self._stack), len("".join(self.text).strip())))
+        if self._capture is None and not hidden and not skipped:
+            if tag == "a" and attrs.get("href"):
+                self._capture = ("link", attrs, [], len(self._stack))
+            elif tag == "button" or attrs.get("role") == "button":
+                self._capture = ("button", attrs, [], len(self._stack))
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        # Close up to the matching open tag; stray end tags are ignored
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > i:
+            depth = len(self._stack)
+            if self._capture and self._capture[3] == depth:
+                self._finish_capture()
+            if self._root_depths and self._root_depths[-1][0] == depth:
+                _, text_before = self._root_depths.pop()
+                if len("".join(self.text).strip()) == text_before:
+                    self.empty_roots += 1
+            self._stack.pop()
+        if tag in _BLOCK_TAGS:
+            self.text.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+            return
+        tag = self._stack[-1][0] if self._stack else ""
+        if tag == "noscript":
+            self.noscript_text.append(data)
+            return
+        _, hidden, skipped = self._flags
+        if hidden or skipped:
+            return
+        self.text.append(data)
+        if self._capture:
+            self._capture[2].append(data)
+
+    def _finish_capture(self):
+        kind, attrs, parts, in_nav_depth = self._capture
+        self._capture = None
+        text = " ".join("".join(parts).split()) or attrs.get("aria-label", "").strip()
+        if not text or len(text) > 100:
+            return
+        if kind == "button":
+            self.buttons.append({"text": text})
+            return
+        href = urljoin(self.base_url, attrs["href"])
+        if not href.startswith("http"):
+            return
+        in_nav = self._stack[in_nav_depth - 1][1]
+        entry = {"text": text, "href": href, "path": urlsplit(href).path or "/", "in_nav": in_nav}
+        (self.nav_links if in_nav else self.other_links).append(entry)
+
+    def page_text(self) -> str:
+        text = _WHITESPACE.sub(" ", "".join(self.text))
+        lines = (line.strip() for line in text.split("\n"))
+        return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def parse_html(html: str, url: str) -> dict:
+    """Title, visible text and dom_elements of a static HTML document, plus SPA signals."""
+    parser = _PageParser(url)
+    parser.feed(html)
+    parser.close()
+    content = parser.page_text()
+    return {
+        "title": " ".join(parser.title.split()),
+        "content": content,
+        "dom_elements": {
+            "nav_links": parser.nav_links,
+            "buttons": parser.buttons,
+            "other_links": parser.other_links,
+        },
+        "scripts": parser.scripts,
+        "empty_roots": parser.empty_roots,
+        "noscript_text": " ".join("".join(parser.noscript_text).split()),
+    }
+
+
+def escalation_reason(parsed: dict) -> str | None:
+    """Why a statically parsed page needs a browser, or None if the HTML is complete."""
+    text_length = len(parsed["content"])
+    links = parsed["dom_elements"]["nav_links"] + parsed["dom_elements"]["other_links"]
+    if text_length < MIN_STATIC_TEXT:
+        return "little_text"
+    if parsed["empty_roots"]:
+        return "empty_app_root"
+    if "javascript" in parsed["noscript_text"].lower() and text_length < MIN_STATIC_TEXT * 4:
+        return "noscript_notice"
+    if parsed["scripts"] and text_length / parsed["scripts"] < MIN_TEXT_PER_SCRIPT:
+        return "script_heavy"
+    if len(links) < MIN_STATIC_LINKS:
+        return "few_links"
+    return None
+
+
+class StaticFetcher:
+    """Pooled HTTP client for the crawler's fast path. close() when the crawl is done."""
+
+    def __init__(self, timeout: float = FETCH_TIMEOUT, max_connections: int = MAX_CONNECTIONS):
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+        )
+        self.static_pages = 0
+        self.escalations = 0
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def fetch(self, url: str) -> tuple[dict | None, str | None]:
+        """GET and parse url. Returns (page_data, None) for a complete static page, or
+        (None, reason) when the page should be rendered in a browser instead."""
+        try:
+            response = await self._client.get(url)
+        except httpx.HTTPError as e:
+            self.escalations += 1
+            return None, f"http_error: {type(e).__name__}"
+        content_type = response.headers.get("content-type", "")
+        if response.status_code >= 400:
+            # Bot walls often answer plain clients with 403/429 but let a real browser through
+            self.escalations += 1
+            return None, f"status_{response.status_code}"
+        if "html" not in content_type:
+            self.escalations += 1
+            return None, f"content_type: {content_type.split(';')[0] or 'unknown'}"
+        # A redirect to another host is left to the browser path (and its same-domain checks)
+        if urlsplit(str(response.url)).netloc != urlsplit(url).netloc:
+            self.escalations += 1
+            return None, "cross_host_redirect"
+        parsed = parse_html(response.text[:MAX_HTML_BYTES], str(response.url))
+        reason = escalation_reason(parsed)
+        if reason:
+            self.escalations += 1
+            return None, reason
+        self.static_pages += 1
+        return {
+            "url": url,
+            "title": parsed["title"],
+            "content": parsed["content"],
+            "dom_elements": parsed["dom_elements"],
+        }, None
+
+    def stats(self) -> dict:
+        return {"static_pages": self.static_pages, "escalations": self.escalations}